@@ -8,8 +8,25 @@ import subprocess
 import platform
 import shutil
 import secrets
+import hashlib
+import sysconfig
 from pathlib import Path
 
+from src.config.paths import INSTALL_DIRS
+
+# Persistent pip cache and local wheelhouse shared across installs
+PIP_CACHE_ROOT = Path.home() / ".cache" / "mcp-media-server"
+WHEELHOUSE_DIR = PIP_CACHE_ROOT / "wheelhouse"
+
+# Fully pinned lock file; when present it is installed without dependency resolution
+LOCK_FILE = "requirements.lock"
+
+def get_requirements_args():
+    """Get the pip arguments for the requirements to install."""
+    if os.path.exists(LOCK_FILE):
+        return ["--no-deps", "-r", LOCK_FILE]
+    return ["-r", "requirements.txt"]
+
 def check_python_version():
     """Check if the Python version is compatible."""
     if sys.version_info < (3, 10):
@@ -21,23 +38,26 @@ def check_python_version():
 
 def check_ffmpeg():
     """Check if ffmpeg is installed."""
-    try:
-        subprocess.run(
-            ["ffmpeg", "-version"], 
-            stdout=subprocess.PIPE, 
-            stderr=subprocess.PIPE, 
-            check=True
-        )
-        print("FFmpeg check passed: FFmpeg is installed")
-        return True
-    except FileNotFoundError:
+    ffmpeg_path = shutil.which("ffmpeg")
+    if not ffmpeg_path:
         print("Warning: FFmpeg not found in PATH.")
         print("Please install FFmpeg before running the MCP Media Server.")
         print("  - Windows: https://ffmpeg.org/download.html")
         print("  - macOS: brew install ffmpeg")
         print("  - Linux: apt install ffmpeg or yum install ffmpeg")
         return False
-    except subprocess.CalledProcessError:
+    
+    try:
+        subprocess.run(
+            [ffmpeg_path, "-version"], 
+            stdout=subprocess.DEVNULL, 
+            stderr=subprocess.DEVNULL, 
+            close_fds=False,
+            check=True
+        )
+        print("FFmpeg check passed: FFmpeg is installed")
+        return True
+    except (FileNotFoundError, subprocess.CalledProcessError):
         print("Warning: FFmpeg is installed but returned an error.")
         return False
 
@@ -52,27 +72,79 @@ def create_virtual_environment():
     print("Virtual environment created.")
 
 def install_dependencies():
-    """Install dependencies from requirements.txt."""
+    """Install dependencies from requirements.lock or requirements.txt."""
     print("Installing dependencies...")
+    requirements_args = get_requirements_args()
+    if "--no-deps" in requirements_args:
+        print(f"Installing pinned dependencies from {LOCK_FILE}")
     
     # Determine the Python executable in the virtual environment
     if platform.system() == "Windows":
         pip_exec = os.path.join("venv", "Scripts", "pip")
+        python_exec = os.path.join("venv", "Scripts", "python")
     else:
         pip_exec = os.path.join("venv", "bin", "pip")
+        python_exec = os.path.join("venv", "bin", "python")
     
-    subprocess.run([pip_exec, "install", "-U", "pip"], check=True)
-    subprocess.run([pip_exec, "install", "-r", "requirements.txt"], check=True)
+    # Prefer uv when available: it downloads and installs packages in parallel
+    uv_exec = shutil.which("uv")
+    if uv_exec:
+        print("Using uv for parallel dependency installation")
+        subprocess.run(
+            [uv_exec, "pip", "install", "--python", python_exec, *requirements_args],
+            check=True
+        )
+    else:
+        env = os.environ.copy()
+        env["PIP_CACHE_DIR"] = str(PIP_CACHE_ROOT / "pip")
+        env["PIP_PREFER_BINARY"] = "1"
+        
+        # Upgrade pip and install requirements in one invocation, offline
+        # from the wheelhouse when possible
+        install_args = [pip_exec, "install", "--upgrade", "pip", *requirements_args]
+        try:
+            populate_wheelhouse(pip_exec, env, requirements_args)
+            subprocess.run(
+                [*install_args, "--no-index", "--find-links", str(WHEELHOUSE_DIR)],
+                check=True,
+                env=env
+            )
+        except subprocess.CalledProcessError:
+            print("Offline install from the wheelhouse failed, installing from the package index...")
+            subprocess.run(install_args, check=True, env=env)
     print("Dependencies installed.")
 
+def populate_wheelhouse(pip_exec, env, requirements_args):
+    """Build wheels into the local wheelhouse unless it already matches this environment."""
+    WHEELHOUSE_DIR.mkdir(parents=True, exist_ok=True)
+    checksum_file = WHEELHOUSE_DIR / "requirements.sha256"
+    
+    # Wheels depend on the interpreter and platform as well as the requirements;
+    # the venv is created with this interpreter
+    checksum = hashlib.sha256(Path(requirements_args[-1]).read_bytes())
+    checksum.update(f"{sys.version_info[:2]}|{sysconfig.get_platform()}".encode())
+    checksum = checksum.hexdigest()
+    
+    if checksum_file.exists() and checksum_file.read_text().strip() == checksum:
+        print("Wheelhouse is up to date, skipping build.")
+        return
+    
+    # pip wheel builds sdists into wheels, so the offline install never
+    # needs a build backend
+    print(f"Building wheels in {WHEELHOUSE_DIR}...")
+    checksum_file.unlink(missing_ok=True)
+    subprocess.run(
+        [pip_exec, "wheel", "-w", str(WHEELHOUSE_DIR), "pip", *requirements_args],
+        check=True,
+        env=env
+    )
+    checksum_file.write_text(checksum)
+
 def create_directories():
     """Create necessary directories."""
-    directories = ["logs", "downloads", "processed", "thumbnails", "cache"]
-    
-    for directory in directories:
-        dir_path = Path(directory)
-        dir_path.mkdir(exist_ok=True)
-        print(f"Directory created: {dir_path}")
+    for directory in INSTALL_DIRS:
+        os.makedirs(directory, exist_ok=True)
+    print(f"Directories ensured: {', '.join(INSTALL_DIRS)}")
 
 def create_env_file():
     """Create .env file from .env.example."""
@@ -87,19 +159,21 @@ def create_env_file():
     print("Creating .env file from .env.example...")
     
     # Generate a JWT secret
-    jwt_secret = secrets.token_hex(32)
+    jwt_secret = secrets.token_hex(32).encode("ascii")
     
-    with open(".env.example", "r") as example_file:
-        env_content = example_file.read()
+    # Work on bytes so line endings are preserved exactly as in the example
+    env_content = Path(".env.example").read_bytes()
     
     # Replace the JWT secret placeholder
     env_content = env_content.replace(
-        "JWT_SECRET=generate_a_secure_random_key_and_replace_this",
-        f"JWT_SECRET={jwt_secret}"
+        b"JWT_SECRET=generate_a_secure_random_key_and_replace_this",
+        b"JWT_SECRET=" + jwt_secret
     )
     
-    with open(".env", "w") as env_file:
-        env_file.write(env_content)
+    # Write via a temporary file so a partial .env is never left behind
+    tmp_path = Path(".env.tmp")
+    tmp_path.write_bytes(env_content)
+    tmp_path.replace(".env")
     
     print(".env file created.")
     print("Please edit .env file to set your API keys and configuration.")
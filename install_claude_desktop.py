@@ -9,6 +9,12 @@ import platform
 import argparse
 from pathlib import Path
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 def find_claude_config():
     """Find the Claude Desktop configuration file."""
     config_path = None
@@ -65,9 +71,9 @@ def update_claude_config(server_name="mcp-media-server"):
     config = {}
     if config_path.exists():
         try:
-            with open(config_path, "r") as f:
-                config = json.load(f)
-        except json.JSONDecodeError:
+            data = config_path.read_bytes()
+            config = orjson.loads(data) if HAS_ORJSON else json.loads(data)
+        except ValueError:
             print("Warning: Existing configuration is invalid. Creating a new one.")
     
     # Ensure the mcpServers section exists
@@ -84,16 +90,22 @@ def update_claude_config(server_name="mcp-media-server"):
         "args": [str(server_path)]
     }
     
-    # Write the updated configuration
+    # Write the updated configuration atomically via a temporary file
+    tmp_path = config_path.with_suffix(".json.tmp")
     try:
-        with open(config_path, "w") as f:
-            json.dump(config, f, indent=2)
+        if HAS_ORJSON:
+            data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(config, indent=2).encode("utf-8")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, config_path)
         
         print(f"MCP server '{server_name}' added to Claude Desktop configuration.")
         print(f"Configuration updated at: {config_path}")
         return True
     
     except Exception as e:
+        tmp_path.unlink(missing_ok=True)
         print(f"Error updating configuration: {e}")
         return False
 
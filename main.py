@@ -4,16 +4,33 @@ Enhanced for production with error handling, recovery, and monitoring.
 """
 import os
 import sys
+
+# Guard against restart loops before paying for any heavy imports
+if __name__ == "__main__":
+    _restart_count = int(os.environ.get("MCP_RESTART_COUNT", "0"))
+    if _restart_count > 5:
+        sys.stderr.write("Too many restart attempts, exiting\n")
+        sys.exit(1)
+    os.environ["MCP_RESTART_COUNT"] = str(_restart_count + 1)
+
 import asyncio
 import logging
+import logging.handlers
+import queue
 import argparse
 import signal
-import traceback
+import shutil
 import time
 from datetime import datetime
 from pathlib import Path
 from functools import partial
 
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
 # Ensure proper Python version
 if sys.version_info < (3, 9):
     print("Error: Python 3.9 or higher is required.")
@@ -33,16 +50,23 @@ logger = logging.getLogger(__name__)
 shutdown_requested = False
 restart_requested = False
 
+# Event set on shutdown so the server loop wakes immediately; created in start_server
+shutdown_event = None
+_event_loop = None
+
 # Import settings first to handle early configuration
 try:
     from src.config.settings import get_settings
+    from src.config.paths import absolute_paths
     settings = get_settings()
 except Exception as e:
     logger.critical(f"Failed to load settings: {e}")
     print(f"CRITICAL ERROR: Failed to load settings: {e}")
     sys.exit(1)
 
-# Set up proper logging with file handlers
+# Set up proper logging with file handlers behind a queue, so log calls only
+# enqueue records and formatting/disk writes happen on a listener thread
+log_listener = None
 try:
     log_dir = Path(settings.get_absolute_path("logs"))
     log_dir.mkdir(exist_ok=True, parents=True)
@@ -84,33 +108,30 @@ try:
     # Add filters to error handler
     error_handler.setLevel(logging.ERROR)
     
-    # Add handlers to root logger
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(error_handler)
+    # Route the root logger through a queue to the handlers
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    log_listener = logging.handlers.QueueListener(
+        log_queue,
+        console_handler,
+        file_handler,
+        error_handler,
+        respect_handler_level=True
+    )
+    log_listener.start()
     
     logger.info("Logging configured successfully")
 except Exception as e:
     print(f"Warning: Error setting up logging: {e}")
     # Proceed with basic logging
 
-# Import server components
+# Import the core server; heavier components are imported where they are used
 try:
-    # Core components
     from src.core.server import mcp_server
-    from src.tasks.scheduler import scheduler
-    from src.utils.error_monitor import error_monitor
-    from src.utils.backup_manager import backup_manager
-    from src.db.connection_manager import connection_manager
-    from src.config.key_manager import key_manager
-    
-    # Import all tools to register them
-    import src.tools.youtube_tools
-    import src.tools.ffmpeg_tools
-    import src.tools.vector_tools
-except Exception as e:
-    logger.critical(f"Failed to import required components: {e}")
-    traceback.print_exc()
+except Exception:
+    logger.critical("Failed to import required components", exc_info=True)
+    if log_listener is not None:
+        log_listener.stop()
     sys.exit(1)
 
 def signal_handler(signum, frame):
@@ -124,6 +145,10 @@ def signal_handler(signum, frame):
         logger.info("Received SIGHUP, will restart after shutdown...")
         restart_requested = True
         shutdown_requested = True
+    
+    # Wake the server loop if it is waiting for shutdown
+    if shutdown_event is not None and _event_loop is not None:
+        _event_loop.call_soon_threadsafe(shutdown_event.set)
 
 # Install signal handlers
 signal.signal(signal.SIGINT, signal_handler)
@@ -131,38 +156,101 @@ signal.signal(signal.SIGTERM, signal_handler)
 if hasattr(signal, 'SIGHUP'):  # Not available on Windows
     signal.signal(signal.SIGHUP, signal_handler)
 
+def _register_tools():
+    """
+    Import all tool modules so they register themselves with the MCP server.
+    
+    Called before the event loop starts, so a failed import exits the process
+    before any server task or background task exists.
+    """
+    try:
+        import src.tools.youtube_tools
+        import src.tools.ffmpeg_tools
+        import src.tools.vector_tools
+    except Exception:
+        logger.critical("Failed to import required components", exc_info=True)
+        if log_listener is not None:
+            log_listener.stop()
+        sys.exit(1)
+
+async def get_ffmpeg_version():
+    """
+    Get the installed ffmpeg version, probing the binary only when it changes.
+    
+    The version line is cached in the cache directory and reused as long as
+    the cache file is newer than the ffmpeg binary.
+    
+    Returns:
+        The ffmpeg version line, or None if ffmpeg is missing or broken
+    """
+    ffmpeg_path = shutil.which("ffmpeg")
+    if not ffmpeg_path:
+        return None
+    
+    cache_file = Path(settings.get_absolute_path("cache")) / "ffmpeg.version"
+    try:
+        if cache_file.stat().st_mtime >= os.stat(ffmpeg_path).st_mtime:
+            cached_version = cache_file.read_text().strip()
+            if cached_version:
+                return cached_version
+    except OSError:
+        pass
+    
+    process = await asyncio.create_subprocess_exec(
+        ffmpeg_path, "-version",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+        close_fds=False
+    )
+    stdout, _ = await process.communicate()
+    if process.returncode != 0:
+        return None
+    
+    lines = stdout.decode(errors="replace").splitlines()
+    version = lines[0] if lines else "ffmpeg"
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(version)
+    except OSError as e:
+        logger.debug(f"Could not cache ffmpeg version: {e}")
+    
+    return version
+
 async def check_system_requirements():
     """Check system requirements and dependencies."""
+    from src.config.key_manager import key_manager
+    
     try:
-        # Check for ffmpeg
+        # Check for ffmpeg without blocking the event loop
         try:
-            import subprocess
-            result = subprocess.run(
-                ["ffmpeg", "-version"], 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE
-            )
-            if result.returncode != 0:
+            ffmpeg_version = await get_ffmpeg_version()
+            if not ffmpeg_version:
                 logger.warning("FFmpeg not found or not working properly")
                 print("WARNING: FFmpeg not found or not working properly")
                 print("Media processing functionality may be limited")
             else:
-                logger.info("FFmpeg check passed")
+                logger.info(f"FFmpeg check passed: {ffmpeg_version}")
         except Exception as e:
             logger.warning(f"FFmpeg check failed: {e}")
             print(f"WARNING: FFmpeg check failed: {e}")
             print("Media processing functionality may be limited")
         
         # Check for required directories
-        required_dirs = [
-            "logs", "downloads", "processed", "thumbnails", 
-            "cache", "backups", "keys", "fallbacks"
-        ]
+        dir_paths = absolute_paths()
         
-        for directory in required_dirs:
-            dir_path = Path(settings.get_absolute_path(directory))
-            dir_path.mkdir(exist_ok=True, parents=True)
-            logger.info(f"Ensured directory exists: {dir_path}")
+        # A single scandir of the base directory tells us which ones are missing
+        base_dir = dir_paths[0].parent
+        with os.scandir(base_dir) as entries:
+            existing = {entry.name for entry in entries if entry.is_dir()}
+        missing = [dir_path for dir_path in dir_paths if dir_path.name not in existing]
+        
+        await asyncio.gather(*(
+            asyncio.to_thread(dir_path.mkdir, exist_ok=True, parents=True)
+            for dir_path in missing
+        ))
+        if missing:
+            logger.info(f"Created directories: {', '.join(str(p) for p in missing)}")
+        logger.info(f"Ensured {len(dir_paths)} required directories exist in {base_dir}")
         
         # Check required API keys
         key_status = key_manager.get_all_required_keys()
@@ -181,62 +269,70 @@ async def check_system_requirements():
         logger.error(f"Error checking system requirements: {e}")
         return False
 
-async def initialize_databases():
-    """Initialize database connections with retries."""
-    max_retries = 3
-    retry_delay = 5  # seconds
+async def _retry(name: str, check, max_retries: int = 3, retry_delay: int = 5) -> bool:
+    """
+    Run a connection check with exponential backoff.
     
+    Args:
+        name: Name of the backend, used for logging
+        check: Coroutine function returning True when the backend is healthy
+        max_retries: Maximum number of attempts
+        retry_delay: Initial delay between attempts in seconds
+        
+    Returns:
+        True if the check succeeded within the allowed attempts
+    """
     for attempt in range(1, max_retries + 1):
         try:
-            # Check database connections using the connection manager
-            logger.info(f"Initializing database connections (attempt {attempt}/{max_retries})...")
-            
-            health = await connection_manager.check_all_connections()
-            
-            # Check if both connections are healthy
-            if (health.get("supabase", {}).get("healthy", False) and 
-                health.get("pinecone", {}).get("healthy", False)):
-                logger.info("All database connections initialized successfully")
+            logger.info(f"Initializing {name} connection (attempt {attempt}/{max_retries})...")
+            if await check():
                 return True
-            
-            # If we get here, at least one connection failed
-            if not health.get("supabase", {}).get("healthy", False):
-                logger.warning("Supabase connection failed, will retry")
-            
-            if not health.get("pinecone", {}).get("healthy", False):
-                logger.warning("Pinecone connection failed, will retry")
-            
-            if attempt < max_retries:
-                logger.info(f"Retrying in {retry_delay} seconds...")
-                await asyncio.sleep(retry_delay)
-                retry_delay *= 2  # Exponential backoff
-            else:
-                logger.warning("Maximum retry attempts reached, proceeding with fallbacks")
-                # We'll proceed with fallbacks enabled
-                return False
-            
+            logger.warning(f"{name} connection failed, will retry")
         except Exception as e:
-            logger.error(f"Error initializing databases: {e}")
-            
-            if attempt < max_retries:
-                logger.info(f"Retrying in {retry_delay} seconds...")
-                await asyncio.sleep(retry_delay)
-                retry_delay *= 2  # Exponential backoff
-            else:
-                logger.warning("Maximum retry attempts reached, proceeding with fallbacks")
-                # We'll proceed with fallbacks enabled
-                return False
+            logger.error(f"Error initializing {name} connection: {e}")
+        
+        if attempt < max_retries:
+            logger.info(f"Retrying {name} in {retry_delay} seconds...")
+            await asyncio.sleep(retry_delay)
+            retry_delay *= 2  # Exponential backoff
     
+    logger.warning(f"Maximum retry attempts reached for {name}, proceeding with fallbacks")
     return False
 
+async def initialize_databases():
+    """
+    Initialize database connections with retries.
+    
+    Each backend is probed and retried independently so a failing backend
+    does not cause the healthy one to be re-checked.
+    
+    Returns:
+        Dict mapping each backend to whether its connection is healthy
+    """
+    from src.db.connection_manager import connection_manager
+    
+    results = await asyncio.gather(
+        _retry("Supabase", connection_manager.check_supabase),
+        _retry("Pinecone", connection_manager.check_pinecone),
+        return_exceptions=True
+    )
+    status = {
+        backend: result is True
+        for backend, result in zip(("supabase", "pinecone"), results)
+    }
+    
+    if all(status.values()):
+        logger.info("All database connections initialized successfully")
+    
+    return status
+
 async def start_background_tasks():
-    """Start background tasks for monitoring and maintenance."""
+    """Start background tasks for maintenance."""
+    from src.utils.backup_manager import backup_manager
+    
+    # Database connections are tested on demand by the connection manager
+    # when a client is requested, so there is no polling task
     try:
-        # Start connection monitoring
-        connection_monitor_task = asyncio.create_task(
-            connection_manager.monitor_connections(check_interval=60)
-        )
-        
         # Start automatic backup scheduler
         backup_interval_hours = 24
         automatic_backup_task = asyncio.create_task(
@@ -244,7 +340,7 @@ async def start_background_tasks():
         )
         
         # Return all tasks so they can be cancelled on shutdown
-        return [connection_monitor_task, automatic_backup_task]
+        return [automatic_backup_task]
     except Exception as e:
         logger.error(f"Error starting background tasks: {e}")
         return []
@@ -261,6 +357,9 @@ async def start_api_server():
             host=settings.MCP_SERVER_HOST,
             port=int(settings.MCP_SERVER_PORT),
             log_level="info" if not settings.DEBUG else "debug",
+            # httptools is picked automatically when installed; the per-request
+            # access log is only written in debug mode
+            access_log=settings.DEBUG,
             workers=1
         )
         
@@ -276,6 +375,8 @@ async def start_api_server():
 
 async def perform_system_backup():
     """Perform a system backup on startup/shutdown."""
+    from src.utils.backup_manager import backup_manager
+    
     try:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_info = await backup_manager.create_backup(f"mcp_backup_{timestamp}")
@@ -292,6 +393,8 @@ async def perform_system_backup():
 
 async def graceful_shutdown(background_tasks=None):
     """Perform a graceful shutdown."""
+    from src.tasks.scheduler import scheduler
+    
     logger.info("Performing graceful shutdown...")
     
     # Cancel background tasks
@@ -311,6 +414,10 @@ async def graceful_shutdown(background_tasks=None):
     # Perform a system backup
     await perform_system_backup()
     
+    # Release pooled database connections
+    from src.db.supabase_init import close_supabase_client
+    close_supabase_client()
+    
     logger.info("Shutdown complete")
 
 async def start_server(transport: str = "stdio", run_api: bool = False):
@@ -321,32 +428,51 @@ async def start_server(transport: str = "stdio", run_api: bool = False):
         transport: Transport to use (stdio, sse)
         run_api: Whether to run the API server
     """
-    global shutdown_requested, restart_requested
-    
-    # Check system requirements
-    await check_system_requirements()
-    
-    # Perform initial backup
-    await perform_system_backup()
+    global shutdown_requested, restart_requested, shutdown_event, _event_loop
+    from src.tasks.scheduler import scheduler
     
-    # Initialize databases
-    db_status = await initialize_databases()
-    if not db_status:
+    # Route shutdown signals through the event loop
+    _event_loop = asyncio.get_running_loop()
+    shutdown_event = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM, getattr(signal, "SIGHUP", None)):
+        if signum is None:
+            continue
+        try:
+            _event_loop.add_signal_handler(signum, signal_handler, signum, None)
+        except (NotImplementedError, RuntimeError):
+            # Not supported on Windows, the signal.signal handlers remain in place
+            pass
+    
+    # Check system requirements and initialize databases concurrently
+    # since they are independent of each other
+    _, db_status = await asyncio.gather(
+        check_system_requirements(),
+        initialize_databases(),
+        return_exceptions=True
+    )
+    if not isinstance(db_status, dict) or not all(db_status.values()):
         logger.warning("Database initialization incomplete, proceeding with fallbacks")
     
+    # Create the API server task before the scheduler and background tasks so
+    # it is included in the tasks graceful_shutdown cancels; it only starts
+    # running once this coroutine first awaits
+    api_server_task = None
+    if run_api:
+        api_server_task = asyncio.create_task(start_api_server())
+    
     # Start the task scheduler
     scheduler.start()
     logger.info("Task scheduler started")
     
     # Start background tasks
     background_tasks = await start_background_tasks()
+    if api_server_task:
+        background_tasks.append(api_server_task)
+    
+    # Perform the startup backup off the critical path
+    background_tasks.append(asyncio.create_task(perform_system_backup()))
     
     try:
-        # Start the API server if requested
-        api_server_task = None
-        if run_api:
-            api_server_task = asyncio.create_task(start_api_server())
-        
         # Run the MCP server
         if transport == "sse":
             host = settings.MCP_SERVER_HOST
@@ -358,15 +484,18 @@ async def start_server(transport: str = "stdio", run_api: bool = False):
                 mcp_server.run(transport=transport, host=host, port=port)
             )
             
-            # Monitor for shutdown requests
-            while not shutdown_requested:
-                await asyncio.sleep(1)
-                
-                if mcp_task.done():
-                    exception = mcp_task.exception()
-                    if exception:
-                        logger.error(f"MCP server error: {exception}")
-                        break
+            # Wait until the server exits or shutdown is requested
+            shutdown_wait_task = asyncio.create_task(shutdown_event.wait())
+            done, _ = await asyncio.wait(
+                {mcp_task, shutdown_wait_task},
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            shutdown_wait_task.cancel()
+            
+            if mcp_task in done and not mcp_task.cancelled():
+                exception = mcp_task.exception()
+                if exception:
+                    logger.error(f"MCP server error: {exception}")
             
             # Cancel the MCP task if still running
             if not mcp_task.done():
@@ -394,9 +523,8 @@ async def start_server(transport: str = "stdio", run_api: bool = False):
         logger.info("Shutdown requested via keyboard interrupt")
         shutdown_requested = True
     
-    except Exception as e:
-        logger.error(f"Error running server: {e}")
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error running server")
     
     finally:
         # Perform graceful shutdown
@@ -405,6 +533,8 @@ async def start_server(transport: str = "stdio", run_api: bool = False):
         # Check if restart was requested
         if restart_requested:
             logger.info("Restarting server...")
+            if log_listener is not None:
+                log_listener.stop()
             os.execv(sys.executable, [sys.executable] + sys.argv)
 
 def main():
@@ -450,9 +580,17 @@ def main():
         os.environ["DEBUG"] = "True"
         logging.getLogger().setLevel(logging.DEBUG)
     
+    # Register tools before any client can connect
+    _register_tools()
+    
     # Record start time
     start_time = time.time()
     
+    # The API server shares this process's event loop, so uvloop has to be
+    # installed before the loop is created rather than through uvicorn
+    if HAS_UVLOOP:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    
     # Run the server
     try:
         # For SSE transport or when running the API server, use asyncio
@@ -469,9 +607,8 @@ def main():
         # Normal exit, no need to log
         pass
     
-    except Exception as e:
-        logger.critical(f"Unhandled exception in main: {e}")
-        traceback.print_exc()
+    except Exception:
+        logger.critical("Unhandled exception in main", exc_info=True)
         sys.exit(1)
     
     finally:
@@ -481,8 +618,9 @@ def main():
         minutes, seconds = divmod(remainder, 60)
         logger.info(f"Server uptime: {int(hours)}h {int(minutes)}m {int(seconds)}s")
         
-        # Wait a moment before exiting to allow logs to be written
-        time.sleep(0.5)
+        # Flush queued log records before exiting
+        if log_listener is not None:
+            log_listener.stop()
         
         if restart_requested:
             # Exit with special code to indicate restart
@@ -493,21 +631,4 @@ def main():
 
 
 if __name__ == "__main__":
-    # Check for restart loop
-    if os.environ.get("MCP_RESTART_COUNT"):
-        restart_count = int(os.environ.get("MCP_RESTART_COUNT", "0"))
-        # Prevent infinite restart loops
-        if restart_count > 5:
-            print("Too many restart attempts, exiting")
-            sys.exit(1)
-        os.environ["MCP_RESTART_COUNT"] = str(restart_count + 1)
-    else:
-        os.environ["MCP_RESTART_COUNT"] = "1"
-    
-    # Run main function
-    exit_code = main()
-    
-    # Handle restart if requested
-    if exit_code == 42:
-        print("Restarting...")
-        os.execv(sys.executable, [sys.executable] + sys.argv)
+    main()
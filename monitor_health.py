@@ -4,45 +4,98 @@ Health monitoring script for MCP Media Server.
 Can be run as a standalone service or from a cron job.
 """
 import argparse
+import asyncio
+import atexit
+import concurrent.futures
 import json
 import logging
+import logging.handlers
 import os
+import queue
+import random
+import signal
 import smtplib
 import subprocess
 import sys
+import threading
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
 from email.message import EmailMessage
 from pathlib import Path
+from types import MappingProxyType
 
 import docker
+import orjson
 import requests
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler("logs/health_monitor.log", mode="a"),
-    ],
-)
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as single-line JSON for log ingestion pipelines."""
+
+    def format(self, record):
+        entry = {
+            "ts": record.created,
+            "lvl": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        # Structured fields passed as extra={"fields": {...}}
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+# Configure logging; records are queued and written by a listener thread so
+# console and file I/O never block the monitoring loop
+_log_queue = queue.SimpleQueue()
+_root_logger = logging.getLogger()
+_root_logger.setLevel(logging.INFO)
+_root_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+_log_handlers = [
+    logging.StreamHandler(),
+    logging.FileHandler("logs/health_monitor.log", mode="a"),
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+log_listener.start()
+atexit.register(log_listener.stop)
 logger = logging.getLogger("health_monitor")
 
+
+def use_json_logs():
+    """Switch all log output to structured JSON."""
+    json_formatter = JsonFormatter()
+    for handler in _log_handlers:
+        handler.setFormatter(json_formatter)
+
 # Default configuration
 DEFAULT_CONFIG = {
     "server": {
         "host": "localhost",
         "port": 9000,
+        # Full URLs overriding host/port/endpoints, e.g. for https
+        "health_url": None,
+        "conn_url": None,
         "endpoints": {
             "health": "/health",
             "connection_health": "/admin/connection_health",
+            # Optional endpoint returning health with a "connections" section;
+            # when set, one request per tick replaces the two above
+            "combined": None,
         },
     },
     "monitoring": {
         "check_interval": 60,  # seconds
+        "max_interval_multiplier": 10,  # back off up to this many intervals while healthy
+        "cache_ttl": 0,  # seconds to reuse a probe result, 0 disables caching
         "failure_threshold": 3,
         "recovery_action": "restart",  # none, restart, reboot
+        "recovery_cooldown": 600,  # minimum seconds between restart/reboot actions
+        "recovery_stamp_path": "logs/health_monitor.stamp",  # persists the last recovery time
         "notification_enabled": True,
     },
     "notification": {
@@ -54,16 +107,46 @@ DEFAULT_CONFIG = {
             "password": "",
             "from_address": "alerts@example.com",
             "to_addresses": ["admin@example.com"],
+            "max_batch": 10,  # flush once this many emails are queued
+            "send_schedule": 300,  # seconds between flushes of queued emails
         },
         "slack": {"enabled": False, "webhook_url": ""},
     },
     "docker": {
         "container_name": "mcp-media-server",
         "compose_path": "./docker-compose.yml",
+        "restart_timeout": 120,  # seconds to wait for docker-compose restart
     },
 }
 
 
+def _freeze(value):
+    """Recursively convert dicts and lists into read-only equivalents."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    """Recursively build a mutable deep copy of a frozen configuration."""
+    if isinstance(value, MappingProxyType):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def _format_timestamp(timestamp):
+    """Format an epoch timestamp as an ISO 8601 UTC string."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+# Defaults are shared by every monitor instance, so they must never be mutated
+DEFAULT_CONFIG = _freeze(DEFAULT_CONFIG)
+
+
 class HealthMonitor:
     """Health monitoring system for MCP Media Server."""
 
@@ -74,24 +157,72 @@ class HealthMonitor:
 
         # Monitoring state
         self.failure_count = 0
+        # Timestamps are epoch seconds; they are only formatted for notifications
         self.last_check_time = None
         self.last_success_time = None
         self.last_failure_time = None
         self.last_recovery_time = None
         self.recovery_in_progress = False
+        self._success_streak = 0
+
+        # Flatten frequently used settings out of the nested config
+        self.refresh_config()
+
+        # Time of the last recovery action, kept across monitor restarts
+        self._last_recovery = self._read_recovery_stamp()
+
+        # Recent probe results keyed by URL: (fetched_at, status, data)
+        self._cache = {}
+
+        # Queued email notifications, sent together over one SMTP session
+        self._notif_queue = []
+        self._notif_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        # Set when an urgent notification is queued, so it is sent on the next
+        # flush instead of waiting for the batch schedule
+        self._notif_urgent = False
+
+        # Pooled HTTP session so probes reuse connections between checks
+        self.http = requests.Session()
+        self.http.headers["Connection"] = "keep-alive"
+        adapter = HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=10,
+            max_retries=Retry(total=2, backoff_factor=0.2),
+        )
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+
+        # Worker threads for the blocking probes, shared across ticks
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="hm"
+        )
+
+        # Separate pooled session for Slack so alerts reuse their TLS connection
+        self.slack = requests.Session()
+        self.slack.mount("https://", HTTPAdapter(pool_maxsize=4))
 
         # Docker client for container management
         self.docker_client = None
+        self._container = None
         try:
             self.docker_client = docker.from_env()
             logger.info("Docker client initialized")
+
+            # Cache the container handle so recovery doesn't have to look it up
+            try:
+                self._container = self.docker_client.containers.get(
+                    self.config["docker"]["container_name"]
+                )
+            except Exception as e:
+                logger.warning(f"Container lookup failed, will retry on recovery: {e}")
         except Exception as e:
             logger.warning(f"Docker client initialization failed: {e}")
             logger.warning("Container management will not be available")
 
     def _load_config(self, config_path):
         """Load configuration from file or use defaults."""
-        config = DEFAULT_CONFIG.copy()
+        config = _thaw(DEFAULT_CONFIG)
 
         if config_path and os.path.exists(config_path):
             try:
@@ -109,28 +240,95 @@ class HealthMonitor:
 
         return config
 
+    def refresh_config(self):
+        """Cache frequently used settings; call again after changing self.config."""
+        server_config = self.config["server"]
+        monitoring_config = self.config["monitoring"]
+
+        host = server_config["host"]
+        if ":" in host and not host.startswith("["):
+            # IPv6 literals must be bracketed in URLs
+            host = f"[{host}]"
+        base_url = f"http://{host}:{server_config['port']}"
+
+        self._health_url = (
+            server_config.get("health_url")
+            or base_url + server_config["endpoints"]["health"]
+        )
+        self._conn_url = (
+            server_config.get("conn_url")
+            or base_url + server_config["endpoints"]["connection_health"]
+        )
+        combined_endpoint = server_config["endpoints"].get("combined")
+        self._combined = bool(combined_endpoint)
+        if self._combined:
+            self._health_url = base_url + combined_endpoint
+
+        self._interval = monitoring_config["check_interval"]
+        self._max_multiplier = monitoring_config["max_interval_multiplier"]
+        self._threshold = monitoring_config["failure_threshold"]
+        self._recovery_action = monitoring_config["recovery_action"]
+        self._recovery_cooldown = monitoring_config["recovery_cooldown"]
+        self._recovery_stamp_path = Path(monitoring_config["recovery_stamp_path"])
+        self._email_enabled = self.config["notification"]["email"]["enabled"]
+        self._slack_enabled = self.config["notification"]["slack"]["enabled"]
+        # Notifications are only worth building if some channel will send them
+        self._notify_enabled = monitoring_config["notification_enabled"] and (
+            self._email_enabled or self._slack_enabled
+        )
+        self._cache_ttl = monitoring_config["cache_ttl"]
+
     def _merge_config(self, base, override):
-        """Recursively merge configuration dictionaries."""
-        for key, value in override.items():
-            if key in base and isinstance(base[key], dict) and isinstance(value, dict):
-                self._merge_config(base[key], value)
-            else:
-                base[key] = value
+        """Merge configuration dictionaries, descending into nested dicts."""
+        stack = [(base, override)]
+        while stack:
+            base_level, override_level = stack.pop()
+            for key, value in override_level.items():
+                base_value = base_level.get(key)
+                if type(base_value) is dict and type(value) is dict:
+                    stack.append((base_value, value))
+                else:
+                    base_level[key] = value
+
+    def _cached_result(self, url):
+        """Get a probe result for a URL if it is younger than the cache TTL."""
+        ttl = self._cache_ttl
+        entry = self._cache.get(url)
+        if ttl and entry and time.monotonic() - entry[0] < ttl:
+            return entry[1], entry[2]
+        return None
+
+    def _store_result(self, url, result):
+        """Remember a probe result for a URL."""
+        if self._cache_ttl:
+            self._cache[url] = (time.monotonic(), *result)
+        return result
 
     def check_health(self):
         """Check the health of the MCP Media Server."""
-        self.last_check_time = datetime.now()
+        cached = self._cached_result(self._health_url)
+        if cached is not None:
+            return cached
+        return self._store_result(self._health_url, self._probe_health())
 
-        try:
-            # Construct the health endpoint URL
-            health_url = f"http://{self.config['server']['host']}:{self.config['server']['port']}{self.config['server']['endpoints']['health']}"
+    def check_connection_health(self):
+        """Check the health of database connections."""
+        cached = self._cached_result(self._conn_url)
+        if cached is not None:
+            return cached
+        return self._store_result(self._conn_url, self._probe_connection_health())
+
+    def _probe_health(self):
+        """Request the health endpoint and update the failure state."""
+        self.last_check_time = time.time()
 
+        try:
             # Make the request
-            response = requests.get(health_url, timeout=10)
+            response = self.http.get(self._health_url, timeout=(2, 10))
 
             # Check if the response is valid
             if response.status_code == 200:
-                health_data = response.json()
+                health_data = orjson.loads(response.content)
 
                 # Check if the status is healthy
                 if health_data.get("status") == "healthy":
@@ -157,18 +355,15 @@ class HealthMonitor:
             self._handle_failure(f"Unexpected error: {str(e)}")
             return False, {"status": "error", "message": str(e)}
 
-    def check_connection_health(self):
-        """Check the health of database connections."""
+    def _probe_connection_health(self):
+        """Request the connection health endpoint."""
         try:
-            # Construct the connection health endpoint URL
-            health_url = f"http://{self.config['server']['host']}:{self.config['server']['port']}{self.config['server']['endpoints']['connection_health']}"
-
             # Make the request
-            response = requests.get(health_url, timeout=10)
+            response = self.http.get(self._conn_url, timeout=(2, 10))
 
             # Check if the response is valid
             if response.status_code == 200:
-                health_data = response.json()
+                health_data = orjson.loads(response.content)
                 return True, health_data
             else:
                 logger.warning(
@@ -186,7 +381,8 @@ class HealthMonitor:
 
     def _handle_success(self, health_data):
         """Handle a successful health check."""
-        self.last_success_time = datetime.now()
+        self.last_success_time = time.time()
+        self._success_streak += 1
 
         # Reset failure count if we had failures
         if self.failure_count > 0:
@@ -194,46 +390,71 @@ class HealthMonitor:
             self.failure_count = 0
 
             # Send recovery notification
-            if self.config["monitoring"]["notification_enabled"]:
+            if self._notify_enabled:
                 self._send_notification(
                     "MCP Media Server Recovery",
-                    f"Service has recovered at {self.last_success_time.isoformat()}",
+                    f"Service has recovered at {_format_timestamp(self.last_success_time)}",
                 )
 
     def _handle_failure(self, reason):
         """Handle a failed health check."""
-        self.last_failure_time = datetime.now()
+        self.last_failure_time = time.time()
         self.failure_count += 1
+        self._success_streak = 0
 
         logger.warning(
-            f"Health check failed ({self.failure_count}/{self.config['monitoring']['failure_threshold']}): {reason}"
+            f"Health check failed ({self.failure_count}/{self._threshold}): {reason}",
+            extra={
+                "fields": {
+                    "event": "health_failed",
+                    "failure_count": self.failure_count,
+                    "threshold": self._threshold,
+                    "url": self._health_url,
+                }
+            },
         )
 
         # Check if we've hit the failure threshold
-        if self.failure_count >= self.config["monitoring"]["failure_threshold"]:
+        if self.failure_count >= self._threshold:
             logger.error(
                 f"Failure threshold reached: {self.failure_count} consecutive failures"
             )
 
-            # Take recovery action
+            # Take recovery action in the background so checks keep running;
+            # the failure notification is sent once its outcome is known
             if not self.recovery_in_progress:
-                self._take_recovery_action()
-
-                # Send failure notification
-                if self.config["monitoring"]["notification_enabled"]:
-                    self._send_notification(
-                        "MCP Media Server Failure",
-                        f"Service has failed {self.failure_count} times. "
-                        + f"Last failure at {self.last_failure_time.isoformat()}. "
-                        + f"Recovery action: {self.config['monitoring']['recovery_action']}",
-                    )
-
-    def _take_recovery_action(self):
-        """Take the configured recovery action."""
+                self.recovery_in_progress = True
+                threading.Thread(
+                    target=self._take_recovery_action,
+                    args=(self.failure_count, self.last_failure_time),
+                    name="health-monitor-recovery",
+                    daemon=True,
+                ).start()
+
+    def _take_recovery_action(self, failure_count, failure_time):
+        """
+        Take the configured recovery action and report its outcome.
+
+        Args:
+            failure_count: Consecutive failures that triggered the recovery
+            failure_time: Time of the last of those failures
+        """
         self.recovery_in_progress = True
-        action = self.config["monitoring"]["recovery_action"]
+        action = self._recovery_action
+        outcome = action
 
         try:
+            # Refuse to restart or reboot again while a recent recovery settles
+            if action in ("restart", "reboot"):
+                elapsed = time.time() - self._last_recovery
+                if elapsed < self._recovery_cooldown:
+                    logger.warning(
+                        f"Skipping {action}: last recovery was {int(elapsed)}s ago "
+                        f"(cooldown {self._recovery_cooldown}s)"
+                    )
+                    outcome = f"{action} skipped: cooldown"
+                    return
+
             if action == "none":
                 logger.info("No recovery action configured")
 
@@ -242,39 +463,71 @@ class HealthMonitor:
 
                 if self.docker_client:
                     # Try to restart the Docker container
-                    self._restart_container()
+                    restarted = self._restart_container()
                 else:
                     # Fallback to docker-compose command
-                    self._restart_using_compose()
+                    restarted = self._restart_using_compose()
 
-                self.last_recovery_time = datetime.now()
-                logger.info("Service restart initiated")
+                self.last_recovery_time = time.time()
+                self._write_recovery_stamp()
+                outcome = "restart initiated" if restarted else "restart failed"
+                logger.info(f"Service {outcome}")
 
             elif action == "reboot":
                 logger.warning("Initiating system reboot")
 
                 # This requires proper permissions (usually root)
                 # and should be used with caution
-                self._reboot_system()
+                rebooted = self._reboot_system()
 
-                self.last_recovery_time = datetime.now()
-                logger.info("System reboot initiated")
+                self.last_recovery_time = time.time()
+                self._write_recovery_stamp()
+                outcome = "reboot initiated" if rebooted else "reboot failed"
+                logger.info(f"System {outcome}")
 
             else:
                 logger.warning(f"Unknown recovery action: {action}")
+                outcome = f"{action} skipped: unknown action"
 
         except Exception as e:
             logger.error(f"Failed to take recovery action: {e}")
+            outcome = f"{action} failed: {e}"
 
         finally:
             self.recovery_in_progress = False
 
+            # Send failure notification with what was actually done
+            if self._notify_enabled:
+                self._send_notification(
+                    "MCP Media Server Failure",
+                    f"Service has failed {failure_count} times. "
+                    f"Last failure at {_format_timestamp(failure_time)}. "
+                    f"Recovery action: {outcome}",
+                    urgent=True,
+                )
+                self._maybe_flush_notifications()
+
+    def _read_recovery_stamp(self):
+        """Read the time of the last recovery action, or 0 if unknown."""
+        try:
+            return float(self._recovery_stamp_path.read_text().strip())
+        except (OSError, ValueError):
+            return 0.0
+
+    def _write_recovery_stamp(self):
+        """Record the current time as the last recovery action."""
+        self._last_recovery = time.time()
+        try:
+            self._recovery_stamp_path.write_text(str(self._last_recovery))
+        except OSError as e:
+            logger.warning(f"Failed to write recovery stamp: {e}")
+
     # Implementation of the recovery methods
     def _restart_container(self):
         """Restart the Docker container."""
         try:
             container_name = self.config["docker"]["container_name"]
-            container = self.docker_client.containers.get(container_name)
+            container = self._get_container()
 
             logger.info(f"Stopping container: {container_name}")
             container.stop(timeout=30)  # Give it 30 seconds to stop gracefully
@@ -289,6 +542,20 @@ class HealthMonitor:
             logger.error(f"Failed to restart container: {e}")
             return False
 
+    def _get_container(self):
+        """Get the cached container handle, refreshing it if it has gone away."""
+        if self._container is not None:
+            try:
+                self._container.reload()
+                return self._container
+            except docker.errors.NotFound:
+                logger.info("Cached container no longer exists, looking it up again")
+
+        self._container = self.docker_client.containers.get(
+            self.config["docker"]["container_name"]
+        )
+        return self._container
+
     def _restart_using_compose(self):
         """Restart using docker-compose command."""
         try:
@@ -299,19 +566,29 @@ class HealthMonitor:
                 logger.error(f"Docker Compose file not found: {compose_path}")
                 return False
 
-            # Run docker-compose restart
-            result = subprocess.run(
+            # Run docker-compose restart in its own session with a timeout
+            process = subprocess.Popen(
                 ["docker-compose", "-f", compose_path, "restart"],
-                stdout=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
                 stderr=subprocess.PIPE,
                 text=True,
+                start_new_session=True,
             )
+            try:
+                _, stderr = process.communicate(
+                    timeout=self.config["docker"]["restart_timeout"]
+                )
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                logger.error("docker-compose restart timed out")
+                return False
 
-            if result.returncode == 0:
+            if process.returncode == 0:
                 logger.info("Service restarted successfully via docker-compose")
                 return True
             else:
-                logger.error(f"docker-compose restart failed: {result.stderr}")
+                logger.error(f"docker-compose restart failed: {stderr}")
                 return False
 
         except Exception as e:
@@ -350,28 +627,62 @@ class HealthMonitor:
             logger.error(f"Failed to initiate system reboot: {e}")
             return False
 
-    def _send_notification(self, subject, message):
-        """Send a notification about the health status."""
+    def _send_notification(self, subject, message, urgent=False):
+        """
+        Send a notification about the health status.
+
+        Args:
+            subject: Notification subject
+            message: Notification body
+            urgent: Send queued emails on the next flush instead of batching
+        """
+        if not self._notify_enabled:
+            return
+
         # Email notification
-        if self.config["notification"]["email"]["enabled"]:
-            self._send_email_notification(subject, message)
+        if self._email_enabled:
+            self._send_email_notification(subject, message, urgent)
 
         # Slack notification
-        if self.config["notification"]["slack"]["enabled"]:
+        if self._slack_enabled:
             self._send_slack_notification(subject, message)
 
-    def _send_email_notification(self, subject, message):
-        """Send an email notification."""
-        try:
-            email_config = self.config["notification"]["email"]
-
-            msg = EmailMessage()
-            msg.set_content(message)
-            msg["Subject"] = subject
-            msg["From"] = email_config["from_address"]
-            msg["To"] = ", ".join(email_config["to_addresses"])
+    def _send_email_notification(self, subject, message, urgent=False):
+        """Queue an email notification to be sent with the next batch."""
+        email_config = self.config["notification"]["email"]
+
+        msg = EmailMessage()
+        msg.set_content(message)
+        msg["Subject"] = subject
+        msg["From"] = email_config["from_address"]
+        msg["To"] = ", ".join(email_config["to_addresses"])
+
+        with self._notif_lock:
+            self._notif_queue.append(msg)
+            self._notif_urgent = self._notif_urgent or urgent
+        logger.info(f"Email notification queued: {subject}")
+        return True
+
+    def _maybe_flush_notifications(self, force=False):
+        """Send queued emails when the batch is full or the schedule is due."""
+        email_config = self.config["notification"]["email"]
+
+        with self._notif_lock:
+            due = (
+                force
+                or self._notif_urgent
+                or len(self._notif_queue) >= email_config["max_batch"]
+                or time.monotonic() - self._last_flush >= email_config["send_schedule"]
+            )
+            if not due or not self._notif_queue:
+                return True
+            messages, self._notif_queue = self._notif_queue, []
+            urgent, self._notif_urgent = self._notif_urgent, False
+            self._last_flush = time.monotonic()
 
-            # Connect to SMTP server
+        sent = 0
+        try:
+            # Send every queued message over a single SMTP session
             with smtplib.SMTP(
                 email_config["smtp_server"], email_config["smtp_port"]
             ) as server:
@@ -381,14 +692,19 @@ class HealthMonitor:
                 if email_config["username"] and email_config["password"]:
                     server.login(email_config["username"], email_config["password"])
 
-                # Send the email
-                server.send_message(msg)
+                for msg in messages:
+                    server.send_message(msg)
+                    sent += 1
 
-            logger.info(f"Email notification sent: {subject}")
+            logger.info(f"Sent {len(messages)} email notification(s)")
             return True
 
         except Exception as e:
-            logger.error(f"Failed to send email notification: {e}")
+            logger.error(f"Failed to send email notifications: {e}")
+            # Put unsent messages back in front of anything queued meanwhile
+            with self._notif_lock:
+                self._notif_queue[:0] = messages[sent:]
+                self._notif_urgent = self._notif_urgent or urgent
             return False
 
     def _send_slack_notification(self, subject, message):
@@ -397,11 +713,14 @@ class HealthMonitor:
             webhook_url = self.config["notification"]["slack"]["webhook_url"]
 
             # Prepare the payload
-            payload = {"text": f"*{subject}*\n{message}"}
+            body = orjson.dumps({"text": f"*{subject}*\n{message}"})
 
             # Send the request
-            response = requests.post(
-                webhook_url, json=payload, headers={"Content-Type": "application/json"}
+            response = self.slack.post(
+                webhook_url,
+                data=body,
+                headers={"Content-Type": "application/json"},
+                timeout=5,
             )
 
             if response.status_code == 200:
@@ -422,18 +741,7 @@ class HealthMonitor:
         logger.info("Starting health monitoring")
 
         try:
-            while True:
-                # Check the server health
-                health_status, health_data = self.check_health()
-
-                # Check connection health if server is healthy
-                if health_status:
-                    conn_status, conn_data = self.check_connection_health()
-                    if not conn_status:
-                        logger.warning(f"Connection health check failed: {conn_data}")
-
-                # Wait for the next check
-                time.sleep(self.config["monitoring"]["check_interval"])
+            asyncio.run(self._monitor_loop())
 
         except KeyboardInterrupt:
             logger.info("Health monitoring stopped by user")
@@ -442,6 +750,91 @@ class HealthMonitor:
             logger.error(f"Unexpected error in health monitoring: {e}")
             return False
 
+        finally:
+            self.close()
+
+    async def _monitor_loop(self):
+        """Probe the server endpoints concurrently on every interval."""
+        to_thread = asyncio.to_thread
+        check_health = self.check_health
+        check_connection_health = self.check_connection_health
+
+        # Run the probes on the monitor's own thread pool
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(self._pool)
+
+        # Stop cleanly on SIGTERM (e.g. from systemd or docker) as well as Ctrl+C
+        stop_event = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, stop_event.set)
+            except NotImplementedError:
+                # Windows: fall back to plain signal handlers
+                signal.signal(
+                    signum, lambda *_: loop.call_soon_threadsafe(stop_event.set)
+                )
+
+        # Stagger the first check so monitors started together don't probe in lockstep
+        if await self._wait_for_stop(stop_event, random.uniform(0, 0.2)):
+            return
+
+        while True:
+            if self._combined:
+                # A single request returns both server and connection health
+                health_status, health_data = await to_thread(check_health)
+                conn_status, conn_data = self._split_connection_health(health_data)
+            else:
+                # Check the server and connection health at the same time
+                (health_status, health_data), (conn_status, conn_data) = await asyncio.gather(
+                    to_thread(check_health),
+                    to_thread(check_connection_health),
+                )
+
+            # Connection health only matters if the server is healthy
+            if health_status and not conn_status:
+                logger.warning(f"Connection health check failed: {conn_data}")
+
+            # Send any email notifications that are due
+            await asyncio.to_thread(self._maybe_flush_notifications)
+
+            # Wait for the next check, waking immediately on shutdown
+            if await self._wait_for_stop(stop_event, self._next_interval()):
+                logger.info("Health monitoring stopped by signal")
+                return
+
+    async def _wait_for_stop(self, stop_event, timeout):
+        """Wait up to timeout seconds; return True if a stop was requested."""
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def _split_connection_health(self, health_data):
+        """Extract connection health from a combined health response."""
+        conn_data = health_data.get("connections")
+        if conn_data is None:
+            return False, {"status": "error", "message": "No connection data in health response"}
+        return True, conn_data
+
+    def _next_interval(self):
+        """
+        Get the delay before the next check.
+
+        The interval grows by one base interval for every five consecutive
+        successful checks, up to the configured maximum multiplier, and
+        snaps back to the base interval on any failure.
+        """
+        multiplier = min(1 + self._success_streak // 5, self._max_multiplier)
+        return self._interval * multiplier
+
+    def close(self):
+        """Send pending notifications and release pooled network resources."""
+        self._maybe_flush_notifications(force=True)
+        self._pool.shutdown(wait=True)
+        self.http.close()
+        self.slack.close()
+
 
 def main():
     """Main entry point for the health monitor."""
@@ -456,19 +849,28 @@ def main():
         help="Override check interval from configuration (seconds)",
     )
 
+    parser.add_argument(
+        "--json-logs", action="store_true", help="Emit logs as structured JSON"
+    )
+
     args = parser.parse_args()
 
+    if args.json_logs:
+        use_json_logs()
+
     # Create the health monitor
     monitor = HealthMonitor(args.config)
 
     # Override check interval if provided
     if args.interval is not None:
         monitor.config["monitoring"]["check_interval"] = args.interval
+        monitor.refresh_config()
 
     # Run once or continuously
     if args.once:
         health_status, health_data = monitor.check_health()
-        print(json.dumps(health_data, indent=2))
+        monitor.close()
+        print(orjson.dumps(health_data, option=orjson.OPT_INDENT_2).decode())
         sys.exit(0 if health_status else 1)
     else:
         monitor.run()
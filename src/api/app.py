@@ -3,21 +3,26 @@ FastAPI application for the MCP Media Server.
 """
 import os
 import time
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Tuple, Union, Annotated
 
-from fastapi import FastAPI, Depends, HTTPException, Header, Request, Response
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import orjson
+from fastapi import FastAPI, Depends, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.security import APIKeyHeader, HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
 
 from src.config.settings import get_settings
 from src.auth.security import (
     create_access_token, authenticate_user, decode_token,
-    create_api_key, validate_api_key, revoke_api_key
+    create_api_key, validate_api_key, revoke_api_key,
+    flush_api_key_usage, run_api_key_usage_flusher,
+    ACCESS_TOKEN_EXPIRE_SECONDS
 )
 from src.utils.progress import ProgressTracker
-from src.utils.cache import Cache
+from src.utils.rate_limiter import SlidingWindowRateLimiter
 from src.db.supabase_init import get_supabase_client
 from src.db.pinecone_init import get_pinecone_client
 from src.core.server import mcp_server
@@ -34,7 +39,8 @@ settings = get_settings()
 app = FastAPI(
     title="MCP Media Server API",
     description="API for the MCP Media Server",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -46,67 +52,132 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Security
-security = HTTPBearer()
+# Security schemes; credentials are only checked by routes that depend on them
+api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
+bearer_scheme = HTTPBearer(auto_error=False)
+
+# API docs paths, which are exempt from rate limiting
+PUBLIC_PREFIXES = ("/docs", "/redoc", "/openapi")
+
+# Body of the rate limit response, encoded once
+RATE_LIMITED_BODY = b'{"error":"Rate limit exceeded"}'
+
+# Rate limit settings read on every request, bound once at import
+RATE_LIMIT_ENABLED = settings.RATE_LIMIT_ENABLED
+TRUSTED_PROXIES = settings.TRUSTED_PROXIES
+
+# Database health is cached so frequent load balancer probes do not hit the databases
+HEALTH_CACHE_TTL = 30
+# (expires_at, databases), compared against time.monotonic(); kept out of the
+# shared Cache so probes never evict or collide with other cached entries
+_health_status: Optional[Tuple[float, Dict[str, str]]] = None
+
+# Shared by all requests; the API server runs as a single worker
+rate_limiter = SlidingWindowRateLimiter(
+    settings.RATE_LIMIT_REQUESTS, settings.RATE_LIMIT_PERIOD
+)
+
+
+class ToolResultResponse(ORJSONResponse):
+    """
+    JSON response for tool results returned as-is from hot endpoints.
+    
+    Returning a response directly skips FastAPI's recursive jsonable_encoder
+    pass; values orjson cannot serialize natively (e.g. paths) become strings.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
 
 
 # Rate limiting middleware
 @app.middleware("http")
 async def rate_limit_middleware(request: Request, call_next):
     """Rate limiting middleware."""
-    # Get client IP
-    client_ip = request.client.host
-    
-    # Skip rate limiting for certain paths
-    if request.url.path.startswith("/docs") or request.url.path.startswith("/openapi"):
+    # Skip rate limiting for the API docs
+    if not RATE_LIMIT_ENABLED or request.url.path.startswith(PUBLIC_PREFIXES):
         return await call_next(request)
     
+    # Get client IP; behind a trusted proxy, the last address it forwarded
+    client_ip = request.client.host if request.client else ""
+    if client_ip in TRUSTED_PROXIES:
+        forwarded_for = request.headers.get("x-forwarded-for")
+        if forwarded_for:
+            client_ip = forwarded_for.rsplit(",", 1)[-1].strip()
+    
     # Check rate limiting
-    if settings.RATE_LIMIT_ENABLED:
-        # Implement rate limiting
-        # This is a simple implementation - in production, use Redis or a similar 
-        # distributed cache for proper rate limiting
-        cache = Cache()
-        cache_key = f"rate_limit_{client_ip}"
-        
-        # Get current request count
-        current_count = cache.get(cache_key, 0)
-        
-        if current_count >= settings.RATE_LIMIT_REQUESTS:
-            # Rate limit exceeded
-            return Response(
-                content='{"error": "Rate limit exceeded"}',
-                status_code=429,
-                media_type="application/json"
-            )
-        
-        # Increment request count
-        cache.set(cache_key, current_count + 1, expire_in=settings.RATE_LIMIT_PERIOD)
+    if not rate_limiter.allow(client_ip):
+        # Rate limit exceeded
+        return Response(
+            content=RATE_LIMITED_BODY,
+            status_code=429,
+            media_type="application/json"
+        )
     
     # Continue with the request
     return await call_next(request)
 
 
-# Authentication dependency
+# Background task writing batched API key usage, started with the app
+_usage_flusher_task: Optional[asyncio.Task] = None
+
+
+@app.on_event("startup")
+async def start_usage_flusher():
+    """Start flushing API key last_used_at updates in the background."""
+    global _usage_flusher_task
+    _usage_flusher_task = asyncio.create_task(run_api_key_usage_flusher())
+
+
+@app.on_event("shutdown")
+async def stop_usage_flusher():
+    """Stop the usage flusher and write any remaining updates."""
+    if _usage_flusher_task is not None:
+        _usage_flusher_task.cancel()
+        try:
+            await _usage_flusher_task
+        except asyncio.CancelledError:
+            pass
+    await flush_api_key_usage()
+
+
+# Authentication dependencies; each resolves its credential at most once per
+# request and keeps the result on request.state
 async def get_current_user_from_token(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
 ):
     """Get the current user from a token."""
-    token = credentials.credentials
-    token_data = decode_token(token)
-    
-    if token_data is None:
+    if credentials is None:
         raise HTTPException(
             status_code=401,
-            detail="Invalid authentication credentials",
+            detail="Not authenticated",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    token_data = getattr(request.state, "token_user", None)
+    if token_data is None:
+        token_data = decode_token(credentials.credentials)
+        
+        if token_data is None:
+            raise HTTPException(
+                status_code=401,
+                detail="Invalid authentication credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        
+        request.state.token_user = token_data
+    
     return token_data
 
 
 async def get_current_user_from_api_key(
-    x_api_key: str = Header(None)
+    request: Request,
+    x_api_key: Optional[str] = Depends(api_key_header)
 ):
     """Get the current user from an API key."""
     if x_api_key is None:
@@ -116,20 +187,57 @@ async def get_current_user_from_api_key(
             headers={"WWW-Authenticate": "ApiKey"},
         )
     
-    key_info = await validate_api_key(x_api_key)
-    
+    key_info = getattr(request.state, "api_key_user", None)
     if key_info is None:
-        raise HTTPException(
-            status_code=401,
-            detail="Invalid API key",
-            headers={"WWW-Authenticate": "ApiKey"},
-        )
+        key_info = await validate_api_key(x_api_key)
+        
+        if key_info is None:
+            raise HTTPException(
+                status_code=401,
+                detail="Invalid API key",
+                headers={"WWW-Authenticate": "ApiKey"},
+            )
+        
+        request.state.api_key_user = key_info
     
     return key_info
 
 
+def require_permissions(*permissions: str):
+    """
+    Create a dependency that requires an API key with any of the given permissions.
+    
+    Args:
+        permissions: Permissions that grant access
+        
+    Returns:
+        Dependency returning the API key information
+    """
+    required = frozenset(permissions)
+    
+    async def dependency(user_data = Depends(get_current_user_from_api_key)):
+        if user_data["permissions_set"].isdisjoint(required):
+            raise HTTPException(
+                status_code=403,
+                detail="Insufficient permissions"
+            )
+        return user_data
+    
+    return dependency
+
+
+# Bounded input types, so oversized request bodies are rejected early
+ShortStr = Annotated[str, Field(max_length=2048)]
+UrlList = Annotated[List[ShortStr], Field(max_length=100)]
+
+
 # Define request and response models
-class LoginRequest(BaseModel):
+class RequestModel(BaseModel):
+    """Base model for request bodies."""
+    model_config = ConfigDict(str_max_length=4096)
+
+
+class LoginRequest(RequestModel):
     """Login request model."""
     email: str
     password: str
@@ -139,11 +247,11 @@ class TokenResponse(BaseModel):
     """Token response model."""
     access_token: str
     token_type: str
-    expires_at: str
+    expires_at: int  # Unix timestamp
     user_id: str
 
 
-class ApiKeyRequest(BaseModel):
+class ApiKeyRequest(RequestModel):
     """API key request model."""
     name: str
     permissions: List[str] = ["read"]
@@ -159,9 +267,9 @@ class ApiKeyResponse(BaseModel):
     expires_at: Optional[str] = None
 
 
-class VideoDownloadRequest(BaseModel):
+class VideoDownloadRequest(RequestModel):
     """Video download request model."""
-    url: str
+    url: ShortStr
     format: str = "mp4"
     quality: str = "best"
     audio_only: bool = False
@@ -170,9 +278,9 @@ class VideoDownloadRequest(BaseModel):
     notify_webhook: bool = False
 
 
-class VideoProcessRequest(BaseModel):
+class VideoProcessRequest(RequestModel):
     """Video process request model."""
-    input_file: str
+    input_file: ShortStr
     operation: str = "compress"
     output_format: Optional[str] = None
     resolution: Optional[str] = None
@@ -186,30 +294,30 @@ class VideoProcessRequest(BaseModel):
     notify_webhook: bool = False
 
 
-class BatchVideoDownloadRequest(BaseModel):
+class BatchVideoDownloadRequest(RequestModel):
     """Batch video download request model."""
-    urls: List[str]
+    urls: UrlList
     format: str = "mp4"
     quality: str = "best"
     audio_only: bool = False
     notify_webhook: bool = False
 
 
-class SearchRequest(BaseModel):
+class SearchRequest(RequestModel):
     """Search request model."""
-    query: str
+    query: ShortStr
     max_results: int = 10
 
 
-class VectorSearchRequest(BaseModel):
+class VectorSearchRequest(RequestModel):
     """Vector search request model."""
-    query: str
+    query: ShortStr
     limit: int = 10
     filter: Optional[Dict[str, Any]] = None
     namespace: str = ""
 
 
-class SimilarVideosRequest(BaseModel):
+class SimilarVideosRequest(RequestModel):
     """Similar videos request model."""
     video_id: str
     limit: int = 10
@@ -254,12 +362,12 @@ async def login(login_data: LoginRequest):
     }
     
     access_token = create_access_token(token_data)
-    expires_at = time.time() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    expires_at = int(time.time()) + ACCESS_TOKEN_EXPIRE_SECONDS
     
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "expires_at": datetime.fromtimestamp(expires_at).isoformat(),
+        "expires_at": expires_at,
         "user_id": user.id
     }
 
@@ -314,17 +422,10 @@ async def revoke_api_key_endpoint(
 @app.post("/videos/download")
 async def download_video_endpoint(
     download_data: VideoDownloadRequest,
-    user_data = Depends(get_current_user_from_api_key)
+    user_data = Depends(require_permissions("download", "write"))
 ):
     """Download video endpoint."""
     try:
-        # Check permissions
-        if "download" not in user_data["permissions"] and "write" not in user_data["permissions"]:
-            raise HTTPException(
-                status_code=403,
-                detail="Insufficient permissions"
-            )
-        
         result = await download_youtube(
             url=download_data.url,
             format=download_data.format,
@@ -338,7 +439,7 @@ async def download_video_endpoint(
         # Add the user ID to the response
         result["user_id"] = user_data["user_id"]
         
-        return result
+        return ToolResultResponse(result)
     
     except Exception as e:
         logger.error(f"Error downloading video: {e}")
@@ -351,17 +452,10 @@ async def download_video_endpoint(
 @app.post("/videos/batch-download")
 async def batch_download_videos_endpoint(
     batch_data: BatchVideoDownloadRequest,
-    user_data = Depends(get_current_user_from_api_key)
+    user_data = Depends(require_permissions("download", "write"))
 ):
     """Batch download videos endpoint."""
     try:
-        # Check permissions
-        if "download" not in user_data["permissions"] and "write" not in user_data["permissions"]:
-            raise HTTPException(
-                status_code=403,
-                detail="Insufficient permissions"
-            )
-        
         result = await batch_download_youtube(
             urls=batch_data.urls,
             format=batch_data.format,
@@ -386,17 +480,10 @@ async def batch_download_videos_endpoint(
 @app.post("/videos/process")
 async def process_video_endpoint(
     process_data: VideoProcessRequest,
-    user_data = Depends(get_current_user_from_api_key)
+    user_data = Depends(require_permissions("process", "write"))
 ):
     """Process video endpoint."""
     try:
-        # Check permissions
-        if "process" not in user_data["permissions"] and "write" not in user_data["permissions"]:
-            raise HTTPException(
-                status_code=403,
-                detail="Insufficient permissions"
-            )
-        
         result = await process_video(
             input_file=process_data.input_file,
             operation=process_data.operation,
@@ -429,17 +516,10 @@ async def process_video_endpoint(
 async def analyze_video_endpoint(
     input_file: str,
     analysis_type: str = "technical",
-    user_data = Depends(get_current_user_from_api_key)
+    user_data = Depends(require_permissions("read"))
 ):
     """Analyze video endpoint."""
     try:
-        # Check permissions
-        if "read" not in user_data["permissions"]:
-            raise HTTPException(
-                status_code=403,
-                detail="Insufficient permissions"
-            )
-        
         result = await analyze_video(
             input_file=input_file,
             analysis_type=analysis_type
@@ -458,23 +538,16 @@ async def analyze_video_endpoint(
 @app.post("/videos/search")
 async def search_videos_endpoint(
     search_data: SearchRequest,
-    user_data = Depends(get_current_user_from_api_key)
+    user_data = Depends(require_permissions("read"))
 ):
     """Search videos endpoint."""
     try:
-        # Check permissions
-        if "read" not in user_data["permissions"]:
-            raise HTTPException(
-                status_code=403,
-                detail="Insufficient permissions"
-            )
-        
         result = await search_videos(
             query=search_data.query,
             max_results=search_data.max_results
         )
         
-        return result
+        return ToolResultResponse(result)
     
     except Exception as e:
         logger.error(f"Error searching videos: {e}")
@@ -487,17 +560,10 @@ async def search_videos_endpoint(
 @app.post("/videos/vector-search")
 async def vector_search_endpoint(
     search_data: VectorSearchRequest,
-    user_data = Depends(get_current_user_from_api_key)
+    user_data = Depends(require_permissions("read"))
 ):
     """Vector search endpoint."""
     try:
-        # Check permissions
-        if "read" not in user_data["permissions"]:
-            raise HTTPException(
-                status_code=403,
-                detail="Insufficient permissions"
-            )
-        
         result = await search_videos_by_text(
             query=search_data.query,
             limit=search_data.limit,
@@ -518,17 +584,10 @@ async def vector_search_endpoint(
 @app.post("/videos/similar")
 async def similar_videos_endpoint(
     similar_data: SimilarVideosRequest,
-    user_data = Depends(get_current_user_from_api_key)
+    user_data = Depends(require_permissions("read"))
 ):
     """Similar videos endpoint."""
     try:
-        # Check permissions
-        if "read" not in user_data["permissions"]:
-            raise HTTPException(
-                status_code=403,
-                detail="Insufficient permissions"
-            )
-        
         result = await similar_videos(
             video_id=similar_data.video_id,
             limit=similar_data.limit,
@@ -548,21 +607,14 @@ async def similar_videos_endpoint(
 @app.get("/jobs/{job_id}", response_model=JobStatusResponse)
 async def get_job_status(
     job_id: str,
-    user_data = Depends(get_current_user_from_api_key)
+    user_data = Depends(require_permissions("read"))
 ):
     """Get job status endpoint."""
     try:
-        # Check permissions
-        if "read" not in user_data["permissions"]:
-            raise HTTPException(
-                status_code=403,
-                detail="Insufficient permissions"
-            )
+        # Look the job up without creating a tracker, which would register it
+        job_status = ProgressTracker.get_job(job_id)
         
-        progress_tracker = ProgressTracker(job_id)
-        job_status = progress_tracker.get_progress()
-        
-        if job_status.get("status") == "not_found":
+        if job_status is None:
             raise HTTPException(
                 status_code=404,
                 detail="Job not found"
@@ -580,36 +632,49 @@ async def get_job_status(
         )
 
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint."""
-    # Check if databases are initialized
-    supabase_healthy = False
-    pinecone_healthy = False
-    
+async def _check_supabase() -> bool:
+    """Check that Supabase answers a trivial query."""
     try:
-        # Check Supabase
         supabase = get_supabase_client()
-        supabase_response = supabase.table("videos").select("id").limit(1).execute()
-        supabase_healthy = True
+        await asyncio.to_thread(supabase.table("videos").select("id").limit(1).execute)
+        return True
     except Exception as e:
         logger.error(f"Supabase health check failed: {e}")
-    
+        return False
+
+
+async def _check_pinecone() -> bool:
+    """Check that Pinecone can list its indexes."""
     try:
-        # Check Pinecone
         pinecone = get_pinecone_client()
-        pinecone_indexes = pinecone.client.list_indexes()
-        pinecone_healthy = True
+        await asyncio.to_thread(pinecone.client.list_indexes)
+        return True
     except Exception as e:
         logger.error(f"Pinecone health check failed: {e}")
+        return False
+
+
+@app.get("/health")
+async def health_check():
+    """Health check endpoint."""
+    global _health_status
+    if _health_status is not None and time.monotonic() < _health_status[0]:
+        databases = _health_status[1]
+    else:
+        # Probe both databases concurrently
+        supabase_healthy, pinecone_healthy = await asyncio.gather(
+            _check_supabase(), _check_pinecone()
+        )
+        databases = {
+            "supabase": "healthy" if supabase_healthy else "unhealthy",
+            "pinecone": "healthy" if pinecone_healthy else "unhealthy"
+        }
+        _health_status = (time.monotonic() + HEALTH_CACHE_TTL, databases)
     
     return {
         "status": "healthy",
         "version": "1.0.0",
-        "databases": {
-            "supabase": "healthy" if supabase_healthy else "unhealthy",
-            "pinecone": "healthy" if pinecone_healthy else "unhealthy"
-        },
+        "databases": databases,
         "server_info": {
             "registered_tools": len(mcp_server.get_registered_tools()),
             "registered_resources": len(mcp_server.get_registered_resources()),
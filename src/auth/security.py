@@ -3,15 +3,17 @@ Authentication and security utilities for the MCP Media Server.
 """
 import os
 import time
+import asyncio
 import logging
 import json
-from typing import Dict, Any, List, Optional, Union
-from datetime import datetime, timedelta
+import hashlib
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
+from datetime import datetime, timedelta, timezone
 import secrets
-import string
+from collections import OrderedDict
 
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import bcrypt
+import jwt
 from pydantic import BaseModel
 
 from src.config.settings import get_settings
@@ -21,12 +23,127 @@ logger = logging.getLogger(__name__)
 settings = get_settings()
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = 12
+# bcrypt only uses the first 72 bytes of a password
+BCRYPT_MAX_PASSWORD_BYTES = 72
 
 # Token settings
 SECRET_KEY = settings.JWT_SECRET
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+ACCESS_TOKEN_EXPIRE_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+# Successful token and API key validations are reused for a short time so
+# repeat requests skip the JWT verification and database lookups
+AUTH_CACHE_TTL = 30
+AUTH_CACHE_MAX_ITEMS = 10000
+
+# IDs of API keys used since the last flush; their last_used_at is written
+# in one batched update every LAST_USED_FLUSH_INTERVAL seconds
+LAST_USED_FLUSH_INTERVAL = 5
+_touched_api_keys: Set[str] = set()
+
+
+class _AuthCache:
+    """
+    Bounded in-memory cache of validated tokens and API keys.
+    
+    Kept separate from the shared Cache so other caches can neither evict nor
+    collide with auth entries. Entries are evicted oldest first once the cache
+    is full; the API key ID index is updated whenever an entry goes.
+    """
+    
+    def __init__(self, max_items: int):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_items: Maximum number of entries to keep
+        """
+        self.max_items = max_items
+        # Cache key -> (expires_at on the monotonic clock, value, API key ID)
+        self._entries: "OrderedDict[str, Tuple[float, Any, Optional[str]]]" = OrderedDict()
+        # Cache keys of validated API keys by API key ID, so revocation can evict them
+        self._keys_by_api_key_id: Dict[str, str] = {}
+    
+    def get(self, key: str) -> Any:
+        """
+        Get a cached value.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self._remove(key)
+            return None
+        return entry[1]
+    
+    def set(self, key: str, value: Any, ttl: float, api_key_id: Optional[str] = None):
+        """
+        Cache a value.
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Seconds until the entry expires
+            api_key_id: ID of the API key the entry validates, if any
+        """
+        self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, value, api_key_id)
+        if api_key_id is not None:
+            previous_key = self._keys_by_api_key_id.get(api_key_id)
+            if previous_key is not None and previous_key != key:
+                self._remove(previous_key)
+            self._keys_by_api_key_id[api_key_id] = key
+        
+        while len(self._entries) > self.max_items:
+            self._remove(next(iter(self._entries)))
+    
+    def delete_api_key(self, api_key_id: str):
+        """
+        Evict the cached validation of an API key.
+        
+        Args:
+            api_key_id: API key ID
+        """
+        key = self._keys_by_api_key_id.get(api_key_id)
+        if key is not None:
+            self._remove(key)
+    
+    def _remove(self, key: str):
+        """Remove an entry and its API key ID index entry."""
+        entry = self._entries.pop(key, None)
+        if entry is not None and entry[2] is not None:
+            self._keys_by_api_key_id.pop(entry[2], None)
+
+
+auth_cache = _AuthCache(max_items=AUTH_CACHE_MAX_ITEMS)
+
+
+def _auth_cache_key(prefix: str, secret: str) -> str:
+    """Build a cache key from a hash of a token or API key."""
+    return f"{prefix}:{hashlib.sha256(secret.encode()).hexdigest()}"
+
+
+def _to_timestamp(value: str) -> float:
+    """Convert an ISO 8601 timestamp from the database to Unix time, assuming UTC if naive."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _auth_cache_ttl(seconds_left: Optional[float]) -> float:
+    """Get how long a validation may be cached without outliving its expiry."""
+    if seconds_left is None:
+        return AUTH_CACHE_TTL
+    return min(AUTH_CACHE_TTL, seconds_left)
 
 
 class Token(BaseModel):
@@ -55,14 +172,29 @@ class UserData(BaseModel):
     permissions: List[str] = []
 
 
+async def _execute(query):
+    """Execute a Supabase query in a worker thread so it does not block the event loop."""
+    return await asyncio.to_thread(query.execute)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return bcrypt.checkpw(
+            plain_password.encode()[:BCRYPT_MAX_PASSWORD_BYTES],
+            hashed_password.encode()
+        )
+    except ValueError:
+        # Malformed hash
+        return False
 
 
 def get_password_hash(password: str) -> str:
     """Generate a password hash."""
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(
+        password.encode()[:BCRYPT_MAX_PASSWORD_BYTES],
+        bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    ).decode()
 
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
@@ -78,10 +210,11 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     """
     to_encode = data.copy()
     
+    # JWT expiry is a Unix timestamp, so compute it from the clock directly
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = int(time.time() + expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = int(time.time()) + ACCESS_TOKEN_EXPIRE_SECONDS
     
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
@@ -103,18 +236,21 @@ async def get_user_by_email(email: str) -> Optional[UserData]:
         supabase = get_supabase_client()
         
         # Check if the user exists in Supabase Auth
-        user_response = supabase.auth.admin.get_user_by_email(email)
+        user_response = await asyncio.to_thread(
+            supabase.auth.admin.get_user_by_email, email
+        )
         
         if not user_response or not user_response.user:
             return None
         
         # Get user data from the database
         user_id = user_response.user.id
-        user_data_response = supabase.table("users") \
-            .select("*") \
-            .eq("id", user_id) \
-            .limit(1) \
-            .execute()
+        user_data_response = await _execute(
+            supabase.table("users")
+            .select("*")
+            .eq("id", user_id)
+            .limit(1)
+        )
         
         if not user_data_response.data:
             # User exists in Auth but not in the database
@@ -128,7 +264,7 @@ async def get_user_by_email(email: str) -> Optional[UserData]:
                 "permissions": ["read"]
             }
             
-            supabase.table("users").insert(user_data).execute()
+            await _execute(supabase.table("users").insert(user_data))
         else:
             user_data = user_data_response.data[0]
         
@@ -161,21 +297,22 @@ async def authenticate_user(email: str, password: str) -> Optional[UserData]:
         supabase = get_supabase_client()
         
         # Sign in with email and password
-        auth_response = supabase.auth.sign_in_with_password({
-            "email": email,
-            "password": password
-        })
+        auth_response = await asyncio.to_thread(
+            supabase.auth.sign_in_with_password,
+            {"email": email, "password": password}
+        )
         
         if not auth_response or not auth_response.user:
             return None
         
         # Get user data
         user_id = auth_response.user.id
-        user_data_response = supabase.table("users") \
-            .select("*") \
-            .eq("id", user_id) \
-            .limit(1) \
-            .execute()
+        user_data_response = await _execute(
+            supabase.table("users")
+            .select("*")
+            .eq("id", user_id)
+            .limit(1)
+        )
         
         if not user_data_response.data:
             # User exists in Auth but not in the database
@@ -189,7 +326,7 @@ async def authenticate_user(email: str, password: str) -> Optional[UserData]:
                 "permissions": ["read"]
             }
             
-            supabase.table("users").insert(user_data).execute()
+            await _execute(supabase.table("users").insert(user_data))
         else:
             user_data = user_data_response.data[0]
         
@@ -217,6 +354,11 @@ def decode_token(token: str) -> Optional[TokenData]:
     Returns:
         TokenData if valid, None otherwise
     """
+    cache_key = _auth_cache_key("auth_token", token)
+    token_data = auth_cache.get(cache_key)
+    if token_data is not None:
+        return token_data
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         
@@ -228,14 +370,21 @@ def decode_token(token: str) -> Optional[TokenData]:
         if user_id is None:
             return None
         
-        return TokenData(
+        token_data = TokenData(
             user_id=user_id,
             email=email,
             permissions=permissions,
             exp=exp
         )
+        
+        # Only successful decodes are cached, and never past the token's expiry
+        ttl = _auth_cache_ttl(exp - time.time() if exp else None)
+        if ttl > 0:
+            auth_cache.set(cache_key, token_data, ttl)
+        
+        return token_data
     
-    except JWTError:
+    except jwt.InvalidTokenError:
         return None
 
 
@@ -249,8 +398,8 @@ def generate_api_key(length: int = 32) -> str:
     Returns:
         API key string
     """
-    alphabet = string.ascii_letters + string.digits
-    api_key = ''.join(secrets.choice(alphabet) for _ in range(length))
+    # Base64 encodes 3 random bytes as 4 URL-safe characters
+    api_key = secrets.token_urlsafe(length * 3 // 4)
     
     # Add a prefix for easy identification
     return f"mcp_{api_key}"
@@ -283,7 +432,9 @@ async def create_api_key(
         # Calculate expiration date if provided
         expires_at = None
         if expires_in_days:
-            expires_at = datetime.utcnow() + timedelta(days=expires_in_days)
+            expires_at = datetime.fromtimestamp(
+                time.time() + expires_in_days * 86400, tz=timezone.utc
+            )
         
         # Store in the database
         api_key_data = {
@@ -294,7 +445,7 @@ async def create_api_key(
             "expires_at": expires_at.isoformat() if expires_at else None
         }
         
-        response = supabase.table("user_api_keys").insert(api_key_data).execute()
+        response = await _execute(supabase.table("user_api_keys").insert(api_key_data))
         
         if not response.data:
             raise ValueError("Failed to create API key")
@@ -320,15 +471,22 @@ async def validate_api_key(api_key: str) -> Optional[Dict[str, Any]]:
     Returns:
         Dict containing the API key information if valid, None otherwise
     """
+    cache_key = _auth_cache_key("auth_api_key", api_key)
+    cached_info = auth_cache.get(cache_key)
+    if cached_info is not None:
+        _touched_api_keys.add(cached_info["api_key_id"])
+        return cached_info
+    
     try:
         supabase = get_supabase_client()
         
         # Find the API key in the database
-        response = supabase.table("user_api_keys") \
-            .select("*") \
-            .eq("api_key", api_key) \
-            .limit(1) \
-            .execute()
+        response = await _execute(
+            supabase.table("user_api_keys")
+            .select("*")
+            .eq("api_key", api_key)
+            .limit(1)
+        )
         
         if not response.data:
             return None
@@ -336,23 +494,22 @@ async def validate_api_key(api_key: str) -> Optional[Dict[str, Any]]:
         key_info = response.data[0]
         
         # Check if the key has expired
+        expires_at_ts = None
         if key_info.get("expires_at"):
-            expires_at = datetime.fromisoformat(key_info["expires_at"])
-            if expires_at < datetime.utcnow():
+            expires_at_ts = _to_timestamp(key_info["expires_at"])
+            if expires_at_ts < time.time():
                 return None
         
-        # Update last_used_at
-        supabase.table("user_api_keys") \
-            .update({"last_used_at": datetime.utcnow().isoformat()}) \
-            .eq("id", key_info["id"]) \
-            .execute()
+        # Record the use; last_used_at is written by the batched flush
+        _touched_api_keys.add(key_info["id"])
         
         # Get user information
-        user_response = supabase.table("users") \
-            .select("*") \
-            .eq("id", key_info["user_id"]) \
-            .limit(1) \
-            .execute()
+        user_response = await _execute(
+            supabase.table("users")
+            .select("*")
+            .eq("id", key_info["user_id"])
+            .limit(1)
+        )
         
         if not user_response.data:
             return None
@@ -364,11 +521,12 @@ async def validate_api_key(api_key: str) -> Optional[Dict[str, Any]]:
             return None
         
         # Return combined information
-        return {
+        validated_info = {
             "api_key_id": key_info["id"],
             "user_id": key_info["user_id"],
             "name": key_info["name"],
             "permissions": key_info["permissions"],
+            "permissions_set": frozenset(key_info["permissions"]),
             "expires_at": key_info.get("expires_at"),
             "user": {
                 "email": user_info.get("email"),
@@ -376,12 +534,55 @@ async def validate_api_key(api_key: str) -> Optional[Dict[str, Any]]:
                 "is_admin": user_info.get("is_admin", False)
             }
         }
+        
+        # Cache the validation, but not past the key's expiry
+        ttl = _auth_cache_ttl(
+            expires_at_ts - time.time() if expires_at_ts else None
+        )
+        if ttl > 0:
+            auth_cache.set(cache_key, validated_info, ttl, api_key_id=key_info["id"])
+        
+        return validated_info
     
     except Exception as e:
         logger.error(f"Error validating API key: {e}")
         return None
 
 
+def _update_last_used(api_key_ids: List[str]):
+    """Record that a batch of API keys was just used."""
+    try:
+        get_supabase_client().table("user_api_keys") \
+            .update({"last_used_at": datetime.utcnow().isoformat()}) \
+            .in_("id", api_key_ids) \
+            .execute()
+    except Exception as e:
+        logger.error(f"Error updating API key last_used_at: {e}")
+
+
+async def flush_api_key_usage():
+    """Write last_used_at for all API keys used since the previous flush."""
+    if not _touched_api_keys:
+        return
+    
+    # Swap the set out before awaiting so uses during the write are kept
+    api_key_ids = list(_touched_api_keys)
+    _touched_api_keys.clear()
+    await asyncio.to_thread(_update_last_used, api_key_ids)
+
+
+async def run_api_key_usage_flusher(interval: float = LAST_USED_FLUSH_INTERVAL):
+    """
+    Periodically flush buffered API key usage until cancelled.
+    
+    Args:
+        interval: Seconds between flushes
+    """
+    while True:
+        await asyncio.sleep(interval)
+        await flush_api_key_usage()
+
+
 async def revoke_api_key(api_key_id: str, user_id: str) -> bool:
     """
     Revoke an API key.
@@ -397,21 +598,26 @@ async def revoke_api_key(api_key_id: str, user_id: str) -> bool:
         supabase = get_supabase_client()
         
         # Find the API key in the database
-        response = supabase.table("user_api_keys") \
-            .select("*") \
-            .eq("id", api_key_id) \
-            .eq("user_id", user_id) \
-            .limit(1) \
-            .execute()
+        response = await _execute(
+            supabase.table("user_api_keys")
+            .select("*")
+            .eq("id", api_key_id)
+            .eq("user_id", user_id)
+            .limit(1)
+        )
         
         if not response.data:
             return False
         
         # Delete the API key
-        supabase.table("user_api_keys") \
-            .delete() \
-            .eq("id", api_key_id) \
-            .execute()
+        await _execute(
+            supabase.table("user_api_keys")
+            .delete()
+            .eq("id", api_key_id)
+        )
+        
+        # Stop accepting the key from the validation cache
+        auth_cache.delete_api_key(api_key_id)
         
         return True
     
@@ -4,67 +4,107 @@ Handles encryption, rotation, and fallbacks for API keys.
 """
 import os
 import json
-import base64
+import time
+import hashlib
 import logging
-import secrets
+import struct
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
-from datetime import datetime, timedelta
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from typing import Dict, Any, List, Optional, Union
+from datetime import datetime
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 from src.config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Encrypted keys are stored as a little-endian uint32 key ID, a 12-byte
+# nonce and the AES-256-GCM ciphertext with its tag
+KEY_ID_HEADER = struct.Struct("<I")
+GCM_NONCE_SIZE = 12
+CURRENT_KEY_ID = 1
+
+# Keys the server needs to run
+REQUIRED_KEYS = (
+    "SUPABASE_URL",
+    "SUPABASE_KEY",
+    "PINECONE_API_KEY",
+    "OPENAI_API_KEY",
+    "JWT_SECRET"
+)
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize data to JSON bytes, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.dumps(data)
+    return json.dumps(data).encode()
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 class KeyManager:
     """
     Secure key management with encryption, rotation and fallbacks.
     """
-    _instance = None
-    
-    def __new__(cls, *args, **kwargs):
-        """Singleton pattern implementation."""
-        if cls._instance is None:
-            cls._instance = super(KeyManager, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-    
     def __init__(self):
         """Initialize the key manager."""
-        if self._initialized:
-            return
-            
         # Key storage paths
         self.keys_dir = Path(settings.get_absolute_path("keys"))
         self.keys_dir.mkdir(exist_ok=True)
         self.encrypted_keys_path = self.keys_dir / "encrypted_keys.json"
-        self.rotation_log_path = self.keys_dir / "rotation_log.json"
-        
-        # Initialize the encryption key
-        self._initialize_encryption()
+        # Append-only, one JSON object per line
+        self.rotation_log_path = self.keys_dir / "rotation_log.ndjson"
         
-        # Load or initialize keys
-        self.keys = self._load_keys()
+        # Keys are decrypted on first use, so importing the key manager does
+        # not pay for loading cryptography and deriving the encryption key
+        self._keys: Optional[Dict[str, str]] = None
         
-        # Track when keys were last accessed
+        # Track when keys were last accessed (time.monotonic_ns() readings)
         self.key_access = {}
         
-        self._initialized = True
+        # Values resolved from stored keys or the environment, by key name
+        self._resolved_cache: Dict[str, str] = {}
+        
         logger.info("Key Manager initialized")
     
+    @property
+    def keys(self) -> Dict[str, str]:
+        """Stored keys, loaded from encrypted storage on first access."""
+        if self._keys is None:
+            self._initialize_encryption()
+            self._keys = self._load_keys()
+        return self._keys
+    
     def _initialize_encryption(self):
         """Initialize the encryption mechanism."""
+        import base64
+        import hmac
+        import secrets
+        from cryptography.fernet import Fernet
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+        
         # Get or generate a master password
         master_password = os.environ.get("MCP_MASTER_PASSWORD")
+        password_on_disk = False
         if not master_password:
             # Check if we have a stored key
             key_file = self.keys_dir / ".master.key"
             if key_file.exists():
                 with open(key_file, "rb") as f:
                     master_password = f.read().decode('utf-8')
+                password_on_disk = True
             else:
                 # Generate a secure random password and store it
                 master_password = secrets.token_hex(32)
@@ -73,20 +113,69 @@ class KeyManager:
                     with open(key_file, "wb") as f:
                         f.write(master_password.encode('utf-8'))
                     key_file.chmod(0o600)  # Restrictive permissions
+                    password_on_disk = True
         
-        # Derive a key from the password
         password = master_password.encode()
         salt = b'mcp_media_server_salt_fixed'  # Using a fixed salt for reproducibility
         
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
+        # When the master password is already stored next to the keys, caching
+        # the derived key there exposes nothing new and skips PBKDF2 on restart
+        key = None
+        cache_file = None
+        if password_on_disk:
+            fingerprint = hashlib.sha256(password + salt).hexdigest()[:16]
+            cache_file = self.keys_dir / f".fernet.{fingerprint}.cache"
+            if cache_file.exists():
+                key = cache_file.read_bytes()
+                # A Fernet key is 32 bytes, urlsafe base64 encoded
+                if len(key) != 44:
+                    key = None
+        
+        if key is None:
+            # Derive a key from the password; hashlib runs all iterations in
+            # a single OpenSSL call
+            derived = hashlib.pbkdf2_hmac("sha256", password, salt, 100000, dklen=32)
+            key = base64.urlsafe_b64encode(derived)
+            
+            if cache_file is not None:
+                self._write_private_file(cache_file, key)
+        
+        # Fernet is only kept to read files written before the switch to AES-GCM
+        self.legacy_cipher = Fernet(key)
         
-        key = base64.urlsafe_b64encode(kdf.derive(password))
-        self.cipher = Fernet(key)
+        # Separate the AES-GCM key from the Fernet key material
+        aes_key = hmac.new(
+            base64.urlsafe_b64decode(key), b"mcp-keys-aes-gcm", hashlib.sha256
+        ).digest()
+        self.ciphers = {CURRENT_KEY_ID: AESGCM(aes_key)}
+    
+    def _encrypt(self, data: bytes) -> bytes:
+        """Encrypt data with the current AES-GCM key."""
+        nonce = os.urandom(GCM_NONCE_SIZE)
+        ciphertext = self.ciphers[CURRENT_KEY_ID].encrypt(nonce, data, None)
+        return KEY_ID_HEADER.pack(CURRENT_KEY_ID) + nonce + ciphertext
+    
+    def _decrypt(self, data: bytes) -> bytes:
+        """Decrypt data written by _encrypt, or a legacy Fernet token."""
+        # Fernet tokens are base64 text, which never starts with a small key ID
+        if data.startswith(b"gAAAAA"):
+            return self.legacy_cipher.decrypt(data)
+        
+        (key_id,) = KEY_ID_HEADER.unpack_from(data)
+        header_size = KEY_ID_HEADER.size
+        nonce = data[header_size:header_size + GCM_NONCE_SIZE]
+        return self.ciphers[key_id].decrypt(nonce, data[header_size + GCM_NONCE_SIZE:], None)
+    
+    def _write_private_file(self, path: Path, data: bytes):
+        """Atomically write a file that only the owner can read."""
+        temp_path = path.with_suffix('.tmp')
+        try:
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            temp_path.replace(path)
+        except Exception as e:
+            logger.error(f"Error writing {path.name}: {e}")
     
     def _load_keys(self) -> Dict[str, str]:
         """Load keys from encrypted storage or initialize defaults."""
@@ -95,8 +184,8 @@ class KeyManager:
                 with open(self.encrypted_keys_path, "rb") as f:
                     encrypted_data = f.read()
                 
-                decrypted_data = self.cipher.decrypt(encrypted_data)
-                return json.loads(decrypted_data)
+                decrypted_data = self._decrypt(encrypted_data)
+                return _loads(decrypted_data)
             except Exception as e:
                 logger.error(f"Error loading encrypted keys: {e}")
                 logger.warning("Using environment variables as fallback")
@@ -118,7 +207,7 @@ class KeyManager:
         """Save keys to encrypted storage."""
         try:
             # Encrypt the data
-            encrypted_data = self.cipher.encrypt(json.dumps(keys).encode())
+            encrypted_data = self._encrypt(_dumps(keys))
             
             # Create a temporary file first (atomic write)
             temp_path = self.encrypted_keys_path.with_suffix('.tmp')
@@ -147,14 +236,15 @@ class KeyManager:
             The key value
         """
         # Record access time
-        self.key_access[key_name] = datetime.now()
-        
-        # Try to get from stored keys
-        value = self.keys.get(key_name, "")
+        self.key_access[key_name] = time.monotonic_ns()
         
-        # If not found, try environment
-        if not value:
-            value = os.environ.get(key_name, default)
+        value = self._resolved_cache.get(key_name)
+        if value is None:
+            # Try to get from stored keys, then from the environment
+            value = self.keys.get(key_name, "") or os.environ.get(key_name)
+            if value is None:
+                return default
+            self._resolved_cache[key_name] = value
         
         return value
     
@@ -172,12 +262,13 @@ class KeyManager:
         try:
             # Update the key
             self.keys[key_name] = value
+            self._resolved_cache.pop(key_name, None)
             
             # Save the keys
             self._save_keys(self.keys)
             
             # Record access time
-            self.key_access[key_name] = datetime.now()
+            self.key_access[key_name] = time.monotonic_ns()
             
             return True
         except Exception as e:
@@ -205,6 +296,8 @@ class KeyManager:
             # Save the backup
             backup_key_name = f"{key_name}_backup"
             self.keys[backup_key_name] = old_value
+            self._resolved_cache.pop(key_name, None)
+            self._resolved_cache.pop(backup_key_name, None)
             
             # Log the rotation
             self._log_rotation(key_name)
@@ -220,35 +313,49 @@ class KeyManager:
     
     def _log_rotation(self, key_name: str):
         """Log key rotation events."""
-        rotation_log = {}
-        
-        # Load existing log if it exists
-        if self.rotation_log_path.exists():
-            try:
-                with open(self.rotation_log_path, "r") as f:
-                    rotation_log = json.load(f)
-            except Exception as e:
-                logger.error(f"Error loading rotation log: {e}")
-        
-        # Update the log
-        if key_name not in rotation_log:
-            rotation_log[key_name] = []
-        
-        rotation_log[key_name].append({
+        entry = _dumps({
+            "key": key_name,
             "timestamp": datetime.now().isoformat(),
             "rotated_by": "system"
         })
         
-        # Save the log
+        # Append the entry; the file is created with restrictive permissions
         try:
-            with open(self.rotation_log_path, "w") as f:
-                json.dump(rotation_log, f, indent=2)
-            
-            # Set restrictive permissions
-            self.rotation_log_path.chmod(0o600)
+            fd = os.open(
+                self.rotation_log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600
+            )
+            with os.fdopen(fd, "ab") as f:
+                f.write(entry + b"\n")
         except Exception as e:
             logger.error(f"Error saving rotation log: {e}")
     
+    def get_rotation_log(self, key_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get logged key rotation events.
+        
+        Args:
+            key_name: Only return rotations of this key if given
+            
+        Returns:
+            List of rotation events, oldest first
+        """
+        events = []
+        if not self.rotation_log_path.exists():
+            return events
+        
+        try:
+            with open(self.rotation_log_path, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    event = _loads(line)
+                    if key_name is None or event.get("key") == key_name:
+                        events.append(event)
+        except Exception as e:
+            logger.error(f"Error loading rotation log: {e}")
+        
+        return events
+    
     def get_backup_key(self, key_name: str) -> str:
         """
         Get a backup key value.
@@ -281,16 +388,16 @@ class KeyManager:
         Returns:
             Dict mapping key names to validity status
         """
-        required_keys = [
-            "SUPABASE_URL",
-            "SUPABASE_KEY",
-            "PINECONE_API_KEY",
-            "OPENAI_API_KEY",
-            "JWT_SECRET"
-        ]
-        
-        return {key: self.verify_key(key) for key in required_keys}
+        keys = self.keys
+        env = os.environ
+        return {key: bool(keys.get(key) or env.get(key)) for key in REQUIRED_KEYS}
+
+
+@lru_cache()
+def get_key_manager() -> KeyManager:
+    """Get the shared key manager instance."""
+    return KeyManager()
 
 
 # Create and export the key manager instance
-key_manager = KeyManager()
+key_manager = get_key_manager()
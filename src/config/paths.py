@@ -0,0 +1,27 @@
+"""
+Directory layout for the MCP Media Server.
+
+This module only depends on the standard library at import time so it can be
+used by the installer before the project dependencies are installed.
+"""
+from functools import lru_cache
+from pathlib import Path
+from typing import Tuple
+
+# Directories the server needs at runtime
+REQUIRED_DIRS = (
+    "logs", "downloads", "processed", "thumbnails",
+    "cache", "backups", "keys", "fallbacks"
+)
+
+# Directories created by the installer; the rest are created on first start
+INSTALL_DIRS = REQUIRED_DIRS[:5]
+
+
+@lru_cache(maxsize=None)
+def absolute_paths() -> Tuple[Path, ...]:
+    """Get the absolute paths of all required directories."""
+    from src.config.settings import get_settings
+
+    settings = get_settings()
+    return tuple(Path(settings.get_absolute_path(directory)) for directory in REQUIRED_DIRS)
@@ -10,8 +10,11 @@ from pydantic import BaseModel, Field, validator
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
+# Project root; resolved once since resolving the path touches the filesystem
+BASE_PATH = Path(__file__).resolve().parent.parent.parent
+
 # Load environment variables from .env file
-env_path = Path(__file__).resolve().parent.parent.parent / ".env"
+env_path = BASE_PATH / ".env"
 load_dotenv(dotenv_path=env_path)
 
 class Settings(BaseSettings):
@@ -42,6 +45,10 @@ class Settings(BaseSettings):
     RATE_LIMIT_ENABLED: bool = Field(True, description="Enable rate limiting")
     RATE_LIMIT_REQUESTS: int = Field(60, description="Number of requests allowed in the period")
     RATE_LIMIT_PERIOD: int = Field(60, description="Rate limit period in seconds")
+    TRUSTED_PROXIES: str = Field(
+        "",
+        description="Comma-separated addresses of reverse proxies whose X-Forwarded-For header is trusted"
+    )
     
     # Webhook Configuration
     WEBHOOK_ENABLED: bool = Field(True, description="Enable webhooks")
@@ -66,12 +73,19 @@ class Settings(BaseSettings):
         env_file = ".env"
         env_file_encoding = "utf-8"
         case_sensitive = True
+        # The cached instance is shared process-wide and never modified
+        frozen = True
     
     @validator("WEBHOOK_ENDPOINTS")
     def parse_webhook_endpoints(cls, v: str) -> List[str]:
         """Parse comma-separated webhook endpoints into a list."""
         return [endpoint.strip() for endpoint in v.split(",") if endpoint.strip()]
     
+    @validator("TRUSTED_PROXIES")
+    def parse_trusted_proxies(cls, v: str) -> frozenset:
+        """Parse comma-separated proxy addresses into a set."""
+        return frozenset(address.strip() for address in v.split(",") if address.strip())
+    
     @validator("JWT_SECRET")
     def validate_jwt_secret(cls, v: str) -> str:
         """Validate JWT secret and generate one if it's the default."""
@@ -81,8 +95,7 @@ class Settings(BaseSettings):
     
     def get_absolute_path(self, directory: str) -> Path:
         """Get absolute path for a directory."""
-        base_path = Path(__file__).resolve().parent.parent.parent
-        return base_path / directory
+        return BASE_PATH / directory
 
 
 @lru_cache()
@@ -5,16 +5,26 @@ import sys
 import os
 from pathlib import Path
 import logging
+from functools import lru_cache
 from typing import Optional, Dict, Any
 
+# Project root, resolved once
+BASE_PATH = Path(__file__).resolve().parent.parent.parent
+
 # Add parent directory to path so we can import from the src directory
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+sys.path.insert(0, str(BASE_PATH))
 
 # Import MCP SDK
 from mcp.server.fastmcp import FastMCP
 
 # Import configuration
 from src.config.settings import get_settings
+from src.config.paths import INSTALL_DIRS
+
+# Create directories if they don't exist; logs has to exist before the
+# log file below is opened
+for directory in INSTALL_DIRS:
+    (BASE_PATH / directory).mkdir(exist_ok=True)
 
 # Configure logging
 logging.basicConfig(
@@ -22,36 +32,19 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     handlers=[
         logging.StreamHandler(),
-        logging.FileHandler(Path(__file__).parent.parent.parent / "logs" / "server.log", mode="a")
+        logging.FileHandler(BASE_PATH / "logs" / "server.log", mode="a")
     ]
 )
 logger = logging.getLogger(__name__)
-
-# Create directories if they don't exist
-for directory in ["logs", "downloads", "processed", "thumbnails", "cache"]:
-    dir_path = Path(__file__).parent.parent.parent / directory
-    dir_path.mkdir(exist_ok=True)
-    logger.info(f"Ensuring directory exists: {dir_path}")
+logger.info(f"Directories ensured: {', '.join(INSTALL_DIRS)}")
 
 class MCPMediaServer:
     """
     MCP Media Server that integrates yt-dlp, ffmpeg, Supabase, and Pinecone.
     """
     
-    _instance = None
-    
-    def __new__(cls, *args, **kwargs):
-        """Singleton pattern to ensure only one server instance exists."""
-        if cls._instance is None:
-            cls._instance = super(MCPMediaServer, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-    
     def __init__(self, name: str = "Media Processing Server"):
-        """Initialize the MCP server if not already initialized."""
-        if self._initialized:
-            return
-            
+        """Initialize the MCP server."""
         self.settings = get_settings()
         self.name = name
         
@@ -62,9 +55,6 @@ class MCPMediaServer:
         self._tools = {}
         self._resources = {}
         self._prompts = {}
-        
-        # Mark as initialized
-        self._initialized = True
         logger.info(f"MCPMediaServer '{name}' initialized")
     
     def register_tool(self, func):
@@ -115,5 +105,11 @@ class MCPMediaServer:
         return self._prompts
 
 
+@lru_cache()
+def get_mcp_server() -> MCPMediaServer:
+    """Get the shared server instance."""
+    return MCPMediaServer()
+
+
 # Create and export the server instance
-mcp_server = MCPMediaServer()
+mcp_server = get_mcp_server()
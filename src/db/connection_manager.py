@@ -6,6 +6,7 @@ import os
 import logging
 import asyncio
 import time
+from functools import lru_cache
 from typing import Dict, Any, Optional, List, Union
 from datetime import datetime, timedelta
 
@@ -16,29 +17,44 @@ from src.utils.error_monitor import error_monitor, ErrorSeverity
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Client modules are imported once; if a client library is missing the
+# manager still works through its fallbacks
+try:
+    from src.db import supabase_init
+except ImportError as e:
+    logger.error(f"Supabase client unavailable: {e}")
+    supabase_init = None
+
+try:
+    from src.db import pinecone_init
+except ImportError as e:
+    logger.error(f"Pinecone client unavailable: {e}")
+    pinecone_init = None
+
+# A client that passed a connection test this recently is returned without
+# probing the database again
+HEALTH_CHECK_TTL_NS = 30 * 1_000_000_000
+
+
+def _monotonic_to_datetime(timestamp_ns: Optional[int]) -> Optional[datetime]:
+    """Convert a time.monotonic_ns() reading to the wall-clock time it happened."""
+    if timestamp_ns is None:
+        return None
+    elapsed = time.monotonic_ns() - timestamp_ns
+    return datetime.now() - timedelta(microseconds=elapsed // 1000)
+
+
 class ConnectionManager:
     """
     Manages database connections with monitoring and fallbacks.
     """
-    _instance = None
-    
-    def __new__(cls, *args, **kwargs):
-        """Singleton pattern implementation."""
-        if cls._instance is None:
-            cls._instance = super(ConnectionManager, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-    
     def __init__(self):
         """Initialize the connection manager."""
-        if self._initialized:
-            return
-            
         # Connection pools
         self.supabase_clients = {}
         self.pinecone_clients = {}
         
-        # Connection health
+        # Connection health; check times are time.monotonic_ns() readings
         self.connection_health = {
             "supabase": {
                 "healthy": False,
@@ -67,7 +83,6 @@ class ConnectionManager:
             recovery_timeout=60
         )
         
-        self._initialized = True
         logger.info("Connection Manager initialized")
     
     async def get_supabase_client(self, use_fallback: bool = True) -> Any:
@@ -88,21 +103,32 @@ class ConnectionManager:
             # Use fallback if available
             return await self._get_supabase_fallback()
         
+        # Reuse the client while its last successful test is recent
+        health = self.connection_health["supabase"]
+        client = self.supabase_clients.get("primary")
+        if (
+            client is not None
+            and health["healthy"]
+            and time.monotonic_ns() - health["last_success"] < HEALTH_CHECK_TTL_NS
+        ):
+            return client
+        
         try:
-            from src.db.supabase_init import get_supabase_client as get_client
-            
             # Update health check
-            self.connection_health["supabase"]["last_check"] = datetime.now()
+            self.connection_health["supabase"]["last_check"] = time.monotonic_ns()
             
             # Get client
-            client = get_client()
+            if supabase_init is None:
+                raise RuntimeError("Supabase client library is not installed")
+            client = supabase_init.get_supabase_client()
             
             # Test connection
             await self._test_supabase_connection(client)
+            self.supabase_clients["primary"] = client
             
             # Update health metrics
             self.connection_health["supabase"]["healthy"] = True
-            self.connection_health["supabase"]["last_success"] = datetime.now()
+            self.connection_health["supabase"]["last_success"] = time.monotonic_ns()
             self.connection_health["supabase"]["failure_count"] = 0
             
             # Record success for circuit breaker
@@ -131,11 +157,8 @@ class ConnectionManager:
     async def _test_supabase_connection(self, client):
         """Test Supabase connection by executing a simple query."""
         try:
-            # Execute a simple query
-            response = client.table("videos").select("id").limit(1).execute()
-            
-            # Force evaluation of the response
-            list(response.data)
+            # Execute a simple query; execute() raises on network or auth errors
+            client.table("videos").select("id").limit(1).execute()
             
             return True
         except Exception as e:
@@ -150,9 +173,13 @@ class ConnectionManager:
         
         if backup_url and backup_key:
             try:
-                from supabase import create_client, Client
-                
-                client = create_client(backup_url, backup_key)
+                # Create the backup client once and keep its connections
+                client = self.supabase_clients.get("backup")
+                if client is None:
+                    from supabase import create_client, Client
+                    
+                    client = create_client(backup_url, backup_key)
+                    self.supabase_clients["backup"] = client
                 
                 # Test connection
                 await self._test_supabase_connection(client)
@@ -168,8 +195,11 @@ class ConnectionManager:
         
         # This is a simplified mock that provides minimal functionality
         # In a real implementation, this would be more sophisticated
-        from src.db.fallbacks.supabase_fallback import LocalSupabaseFallback
-        return LocalSupabaseFallback()
+        client = self.supabase_clients.get("local")
+        if client is None:
+            from src.db.fallbacks.supabase_fallback import LocalSupabaseFallback
+            client = self.supabase_clients["local"] = LocalSupabaseFallback()
+        return client
     
     async def get_pinecone_client(self, use_fallback: bool = True) -> Any:
         """
@@ -189,21 +219,32 @@ class ConnectionManager:
             # Use fallback if available
             return await self._get_pinecone_fallback()
         
+        # Reuse the client while its last successful test is recent
+        health = self.connection_health["pinecone"]
+        client = self.pinecone_clients.get("primary")
+        if (
+            client is not None
+            and health["healthy"]
+            and time.monotonic_ns() - health["last_success"] < HEALTH_CHECK_TTL_NS
+        ):
+            return client
+        
         try:
-            from src.db.pinecone_init import get_pinecone_client as get_client
-            
             # Update health check
-            self.connection_health["pinecone"]["last_check"] = datetime.now()
+            self.connection_health["pinecone"]["last_check"] = time.monotonic_ns()
             
             # Get client
-            client = get_client()
+            if pinecone_init is None:
+                raise RuntimeError("Pinecone client library is not installed")
+            client = pinecone_init.get_pinecone_client()
             
             # Test connection
             await self._test_pinecone_connection(client)
+            self.pinecone_clients["primary"] = client
             
             # Update health metrics
             self.connection_health["pinecone"]["healthy"] = True
-            self.connection_health["pinecone"]["last_success"] = datetime.now()
+            self.connection_health["pinecone"]["last_success"] = time.monotonic_ns()
             self.connection_health["pinecone"]["failure_count"] = 0
             
             # Record success for circuit breaker
@@ -232,11 +273,8 @@ class ConnectionManager:
     async def _test_pinecone_connection(self, client):
         """Test Pinecone connection by listing indexes."""
         try:
-            # List indexes to test connection
-            indexes = client.client.list_indexes()
-            
-            # Force evaluation
-            list(indexes)
+            # List indexes to test connection; the call raises on failure
+            client.client.list_indexes()
             
             return True
         except Exception as e:
@@ -250,9 +288,13 @@ class ConnectionManager:
         
         if backup_key:
             try:
-                from pinecone import Pinecone
-                
-                client = Pinecone(api_key=backup_key)
+                # Create the backup client once and keep its connections
+                client = self.pinecone_clients.get("backup")
+                if client is None:
+                    from pinecone import Pinecone
+                    
+                    client = Pinecone(api_key=backup_key)
+                    self.pinecone_clients["backup"] = client
                 
                 # Test connection
                 client.list_indexes()
@@ -268,8 +310,11 @@ class ConnectionManager:
         
         # This is a simplified mock that provides minimal functionality
         # In a real implementation, this would be more sophisticated
-        from src.db.fallbacks.pinecone_fallback import LocalPineconeFallback
-        return LocalPineconeFallback()
+        client = self.pinecone_clients.get("local")
+        if client is None:
+            from src.db.fallbacks.pinecone_fallback import LocalPineconeFallback
+            client = self.pinecone_clients["local"] = LocalPineconeFallback()
+        return client
     
     async def get_connection_health(self) -> Dict[str, Any]:
         """
@@ -278,31 +323,58 @@ class ConnectionManager:
         Returns:
             Dict containing health information
         """
+        health = {
+            backend: {
+                **status,
+                "last_check": _monotonic_to_datetime(status["last_check"]),
+                "last_success": _monotonic_to_datetime(status["last_success"])
+            }
+            for backend, status in self.connection_health.items()
+        }
+        
         return {
-            "supabase": self.connection_health["supabase"],
-            "pinecone": self.connection_health["pinecone"],
+            "supabase": health["supabase"],
+            "pinecone": health["pinecone"],
             "circuit_breakers": {
                 "supabase": self.supabase_circuit.state.value,
                 "pinecone": self.pinecone_circuit.state.value
             }
         }
     
+    async def check_supabase(self) -> bool:
+        """
+        Check the health of the Supabase connection.
+        
+        Returns:
+            True if the connection is healthy
+        """
+        try:
+            await self.get_supabase_client(use_fallback=False)
+            logger.info("Supabase connection is healthy")
+            return True
+        except Exception as e:
+            logger.error(f"Supabase connection check failed: {e}")
+            return False
+    
+    async def check_pinecone(self) -> bool:
+        """
+        Check the health of the Pinecone connection.
+        
+        Returns:
+            True if the connection is healthy
+        """
+        try:
+            await self.get_pinecone_client(use_fallback=False)
+            logger.info("Pinecone connection is healthy")
+            return True
+        except Exception as e:
+            logger.error(f"Pinecone connection check failed: {e}")
+            return False
+    
     async def check_all_connections(self):
         """Check the health of all database connections."""
         try:
-            # Check Supabase
-            try:
-                await self.get_supabase_client(use_fallback=False)
-                logger.info("Supabase connection is healthy")
-            except Exception as e:
-                logger.error(f"Supabase connection check failed: {e}")
-            
-            # Check Pinecone
-            try:
-                await self.get_pinecone_client(use_fallback=False)
-                logger.info("Pinecone connection is healthy")
-            except Exception as e:
-                logger.error(f"Pinecone connection check failed: {e}")
+            await asyncio.gather(self.check_supabase(), self.check_pinecone())
             
             return await self.get_connection_health()
         
@@ -312,27 +384,13 @@ class ConnectionManager:
                 "status": "error",
                 "message": str(e)
             }
-    
-    async def monitor_connections(self, check_interval: int = 60):
-        """
-        Continuously monitor database connections.
-        
-        Args:
-            check_interval: Interval between checks in seconds
-        """
-        try:
-            while True:
-                await self.check_all_connections()
-                await asyncio.sleep(check_interval)
-        
-        except asyncio.CancelledError:
-            logger.info("Connection monitoring stopped")
-        except Exception as e:
-            logger.error(f"Error in connection monitoring: {e}")
-            # Auto-restart the monitoring after a delay
-            await asyncio.sleep(60)
-            asyncio.create_task(self.monitor_connections(check_interval))
+
+
+@lru_cache()
+def get_connection_manager() -> ConnectionManager:
+    """Get the shared connection manager instance."""
+    return ConnectionManager()
 
 
 # Create and export the connection manager instance
-connection_manager = ConnectionManager()
+connection_manager = get_connection_manager()
@@ -201,14 +201,33 @@ class SupabaseClient:
     def rpc(self, fn_name: str, params: Dict[str, Any]):
         """Call a Supabase RPC function."""
         return self.client.rpc(fn_name, params)
+    
+    def close(self):
+        """Close the pooled HTTP connections held by the client."""
+        try:
+            self.client.postgrest.session.close()
+            logger.info("Supabase client connections closed")
+        except Exception as e:
+            logger.error(f"Error closing Supabase client: {e}")
 
 
 @lru_cache()
 def get_supabase_client() -> SupabaseClient:
-    """Get a cached Supabase client instance."""
+    """
+    Get a cached Supabase client instance.
+    
+    The client and its keep-alive HTTP connections are reused for the lifetime
+    of the process, so requests after the first skip the TCP and TLS handshakes.
+    """
     return SupabaseClient()
 
 
+def close_supabase_client():
+    """Close the Supabase client connections if the client was created."""
+    if get_supabase_client.cache_info().currsize:
+        get_supabase_client().close()
+
+
 async def init_supabase():
     """Initialize Supabase database."""
     client = get_supabase_client()
@@ -205,7 +205,8 @@ class ProgressTracker:
             Dict containing the job information, or None if not found
         """
         with cls._lock:
-            return cls._progress_data.get(job_id, {}).copy()
+            job_data = cls._progress_data.get(job_id)
+            return job_data.copy() if job_data is not None else None
     
     @classmethod
     def clean_completed_jobs(cls, max_age_seconds: int = 86400) -> int:
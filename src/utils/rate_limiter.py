@@ -0,0 +1,66 @@
+"""
+Sliding-window rate limiting for the API server.
+"""
+import time
+from collections import deque
+from typing import Deque, Dict, Hashable
+
+
+class SlidingWindowRateLimiter:
+    """
+    In-process sliding-window rate limiter.
+
+    Each key may make at most ``limit`` requests in any ``period`` second window.
+    The limiter is meant to be shared by all requests of the API server, which
+    runs as a single uvicorn worker on one event loop, so it needs no locking.
+    """
+
+    def __init__(self, limit: int, period: float):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            limit: Maximum number of requests allowed per key in the window
+            period: Window length in seconds
+        """
+        self.limit = limit
+        self.period = period
+        self._hits: Dict[Hashable, Deque[float]] = {}
+        self._next_sweep = time.monotonic() + period
+
+    def allow(self, key: Hashable) -> bool:
+        """
+        Record a request for a key if it is within the limit.
+
+        Args:
+            key: Key identifying the client (e.g. its IP address)
+
+        Returns:
+            True if the request is allowed, False if the limit is exceeded
+        """
+        now = time.monotonic()
+        cutoff = now - self.period
+
+        if now >= self._next_sweep:
+            self._sweep(cutoff)
+            self._next_sweep = now + self.period
+
+        hits = self._hits.get(key)
+        if hits is None:
+            hits = self._hits[key] = deque()
+
+        # Drop requests that have left the window
+        while hits and hits[0] <= cutoff:
+            hits.popleft()
+
+        if len(hits) >= self.limit:
+            return False
+
+        hits.append(now)
+        return True
+
+    def _sweep(self, cutoff: float):
+        """Forget keys whose requests have all left the window."""
+        idle_keys = [key for key, hits in self._hits.items() if not hits or hits[-1] <= cutoff]
+        for key in idle_keys:
+            del self._hits[key]